@@ -1,43 +1,455 @@
+from array import array
+import random
+import sys
+import time
+
+
 class Array_Edit:
 # трудоёмскость оценивается по отношению к самому этому заданию
 
-    def __init__(self):
-        self.array=[2345,'4342', 543]
+    # typecode=None - обычный список, иначе компактный array.array ('q', 'd', ...)
+    # indexed=True - держать словарь значение -> позиции, чтобы find был O(1)
+    def __init__(self, typecode=None, indexed=False):
+        self.typecode = typecode
+        if typecode is None:
+            self.array=[2345,'4342', 543]
+        else:
+            self.array = array(typecode)
+
+        # в индексе лежат позиции минус offset: вставка в начало сдвигает
+        # все позиции разом, и вместо перестройки меняется только offset
+        self.positions = None
+        self.offset = 0
+        if indexed:
+            self.positions = {}
+            for i, value in enumerate(self.array):
+                self._index_add(value, i)
+
+    def __len__(self):
+        return len(self.array)
+
+    # в индекс идёт уже сохранённое значение: array приводит его к своему типу
+    # (0.1 в 'f' хранится как 0.10000000149...), иначе удаление не найдёт ключ
+    def _index_add(self, value, i):
+        self.positions.setdefault(value, set()).add(i - self.offset)
+
+    def _index_discard(self, value, i):
+        stored = self.positions[value]
+        stored.discard(i - self.offset)
+        if not stored:
+            del self.positions[value]
+
+    # сдвиг хранимых позиций элементов [lo, hi) на delta; идём навстречу сдвигу,
+    # чтобы не наступить на позицию соседа с тем же значением
+    def _index_shift(self, lo, hi, delta):
+        order = range(hi - 1, lo - 1, -1) if delta > 0 else range(lo, hi)
+        for j in order:
+            stored = self.positions[self.array[j]]
+            stored.discard(j - self.offset)
+            stored.add(j - self.offset + delta)
 
     # сложность 1/10
     def pushBack(self,value):
         self.array.append(value)
+        if self.positions is not None:
+            self._index_add(self.array[-1], len(self.array) - 1)
        
     # сложность 1/10
     def pushFront(self,value):
         self.array.insert(0, value) 
+        if self.positions is not None:
+            self.offset += 1
+            self._index_add(self.array[0], 0)
 
     # сложность 3/10
     def insert(self,index, value):
         if 0 <= index < len(self.array):
+            old = self.array[index]
             self.array[index]= value
+            if self.positions is not None:
+                self._index_discard(old, index)
+                self._index_add(self.array[index], index)
         else:
-            self.array.append(value)
+            self.pushBack(value)
 
     # сложность 3/10
     def remove(self,index):
         if 0 <= index < len(self.array):
-             self.array.pop(index) 
+            if self.positions is not None:
+                self._index_discard(self.array[index], index)
+                # правим меньшую половину: хвост сдвигаем на -1
+                # или голову на +1 вместе с offset
+                if index < len(self.array) // 2:
+                    self._index_shift(0, index, 1)
+                    self.offset -= 1
+                else:
+                    self._index_shift(index + 1, len(self.array), -1)
+            self.array.pop(index) 
         else:
             print("Индекс вне диапазона")
 
         
+    # сложность 2/10
+    def extend(self, values):
+        start = len(self.array)
+        self.array.extend(values)
+        if self.positions is not None:
+            for i in range(start, len(self.array)):
+                self._index_add(self.array[i], i)
+
+    # в типизированном режиме срез - memoryview без копирования,
+    # пока он жив, массив нельзя расширять (BufferError)
+    def slice(self, start, stop):
+        if self.typecode is None:
+            return self.array[start:stop]
+        return memoryview(self.array)[start:stop]
+
     # сложность 5/10
     def find(self,value):
         try:
-            return self.array.index(value)
-            
-        except ValueError:
+            if self.positions is not None:
+                if self.typecode is not None:
+                    value = array(self.typecode, [value])[0]
+                return min(self.positions[value]) + self.offset
+            if self.typecode is None:
+                return self.array.index(value)
+            return self._find_raw(value)
+
+        except (KeyError, ValueError, TypeError, OverflowError):
             print("такого нет")
             return -1
+
+    # поиск по сырому буферу: ищем байты значения, а не сравниваем объекты
+    def _find_raw(self, value):
+        needle = array(self.typecode, [value]).tobytes()
+        if self.typecode in 'fd' and (value != value or value == 0):
+            # NaN не равен сам себе, а у 0.0 и -0.0 разные байты
+            return self.array.index(value)
+        size = self.array.itemsize
+        step = size * 8192
+        # идём окнами, кратными размеру элемента, чтобы не копировать весь буфер
+        with memoryview(self.array).cast('B') as raw:
+            for start in range(0, len(raw), step):
+                chunk = raw[start:start + step].tobytes()
+                pos = chunk.find(needle)
+                while pos != -1:
+                    if pos % size == 0:
+                        return (start + pos) // size
+                    pos = chunk.find(needle, pos + 1)
+        raise ValueError(value)
+
+    # сколько байт занимает индекс: словарь, множества позиций и сами числа
+    def index_memory(self):
+        if self.positions is None:
+            return 0
+        total = sys.getsizeof(self.positions)
+        for value, stored in self.positions.items():
+            total += sys.getsizeof(value) + sys.getsizeof(stored)
+            total += sum(sys.getsizeof(pos) for pos in stored)
+        return total
          
 
 
+class GapArray:
+    """Кольцевой буфер с разрывом: свободное место у обоих концов и в точке последней правки"""
+
+    def __init__(self, typecode=None, capacity=16):
+        self.typecode = typecode
+        self.fill = None if typecode is None else 0
+        self.cap = capacity
+        self.buf = self._alloc(capacity)
+        self.start = 0   # физическая позиция элемента 0
+        self.gap = 0     # логический индекс, перед которым стоит разрыв
+        self.size = 0
+
+    def _alloc(self, n):
+        if self.typecode is None:
+            return [None] * n
+        return array(self.typecode, [0]) * n
+
+    def __len__(self):
+        return self.size
+
+    def _pos(self, i):
+        if i >= self.gap:
+            i += self.cap - self.size
+        return (self.start + i) % self.cap
+
+    def __getitem__(self, index):
+        if not 0 <= index < self.size:
+            raise IndexError("Индекс вне диапазона")
+        return self.buf[self._pos(index)]
+
+    def __setitem__(self, index, value):
+        if not 0 <= index < self.size:
+            raise IndexError("Индекс вне диапазона")
+        self.buf[self._pos(index)] = value
+
+    # физические отрезки буфера в логическом порядке: до разрыва и после,
+    # каждый может завернуть через конец буфера
+    def _segments(self):
+        segs = []
+        after = (self.start + self.gap + self.cap - self.size) % self.cap
+        for first, count in ((self.start, self.gap), (after, self.size - self.gap)):
+            end = first + count
+            if end <= self.cap:
+                segs.append((first, end))
+            else:
+                segs.append((first, self.cap))
+                segs.append((0, end - self.cap))
+        return segs
+
+    def __iter__(self):
+        for lo, hi in self._segments():
+            yield from self.buf[lo:hi]
+
+    # перенос count элементов по кольцу срезами, которые не пересекают конец буфера;
+    # при сдвиге вправо идём с конца, чтобы не затереть ещё не перенесённое
+    def _copy(self, src, dst, count, backward):
+        buf, cap = self.buf, self.cap
+        while count:
+            if backward:
+                s_end = (src + count - 1) % cap + 1
+                d_end = (dst + count - 1) % cap + 1
+                n = min(count, s_end, d_end)
+                buf[d_end - n:d_end] = buf[s_end - n:s_end]
+            else:
+                s, d = src % cap, dst % cap
+                n = min(count, cap - s, cap - d)
+                buf[d:d + n] = buf[s:s + n]
+                src += n
+                dst += n
+            count -= n
+
+    def _clear(self, first, count):
+        while count:
+            lo = first % self.cap
+            n = min(count, self.cap - lo)
+            self.buf[lo:lo + n] = self._alloc(n)
+            first += n
+            count -= n
+
+    # сдвигаем разрыв к логическому индексу k, переносим только элементы между
+    def _move_gap(self, k):
+        glen = self.cap - self.size
+        if glen:
+            if k < self.gap:
+                count = self.gap - k
+                self._copy(self.start + k, self.start + k + glen, count, True)
+                self._clear(self.start + k, min(count, glen))
+            else:
+                count = k - self.gap
+                self._copy(self.start + self.gap + glen, self.start + self.gap, count, False)
+                self._clear(self.start + max(self.gap, k - glen) + glen, min(count, glen))
+        self.gap = k
+
+    # разрыв в начале и разрыв в конце в кольце - одно и то же, храним как gap == size
+    def _normalize(self):
+        if self.gap == 0:
+            self.start = (self.start + self.cap - self.size) % self.cap
+            self.gap = self.size
+
+    # разрыв у края: свободное место примыкает и к началу, и к концу
+    def _gap_to_edge(self):
+        if self.gap < self.size - self.gap:
+            self._move_gap(0)
+        else:
+            self._move_gap(self.size)
+        self._normalize()
+
+    def _grow(self):
+        new_buf = self._alloc(self.cap * 2)
+        pos = 0
+        for lo, hi in self._segments():
+            new_buf[pos:pos + hi - lo] = self.buf[lo:hi]
+            pos += hi - lo
+        self.buf = new_buf
+        self.cap *= 2
+        self.start = 0
+        self.gap = self.size
+
+    def pushBack(self, value):
+        if self.size == self.cap:
+            self._grow()
+        self._gap_to_edge()
+        self.buf[(self.start + self.size) % self.cap] = value
+        self.size += 1
+        self.gap = self.size
+
+    def pushFront(self, value):
+        if self.size == self.cap:
+            self._grow()
+        self._gap_to_edge()
+        self.start = (self.start - 1) % self.cap
+        self.buf[self.start] = value
+        self.size += 1
+        self.gap = self.size
+
+    # настоящая вставка со сдвигом, в отличие от insert
+    def insert_at(self, index, value):
+        if index <= 0:
+            return self.pushFront(value)
+        if index >= self.size:
+            return self.pushBack(value)
+        if self.size == self.cap:
+            self._grow()
+        self._move_gap(index)
+        self.buf[(self.start + index) % self.cap] = value
+        self.gap += 1
+        self.size += 1
+
+    # как Array_Edit.insert: заменяет элемент или добавляет в конец
+    def insert(self, index, value):
+        if 0 <= index < self.size:
+            self[index] = value
+        else:
+            self.pushBack(value)
+
+    def remove(self, index):
+        if not 0 <= index < self.size:
+            print("Индекс вне диапазона")
+            return
+        if index == 0 and self.gap == self.size:
+            self.buf[self.start] = self.fill
+            self.start = (self.start + 1) % self.cap
+            self.size -= 1
+            self.gap = self.size
+            return
+        if index >= self.gap:
+            self._move_gap(index)
+            self.buf[self._pos(index)] = self.fill
+        else:
+            self._move_gap(index + 1)
+            self.buf[(self.start + index) % self.cap] = self.fill
+            self.gap = index
+        self.size -= 1
+        self._normalize()
+
+    def extend(self, values):
+        for value in values:
+            self.pushBack(value)
+
+    def find(self, value):
+        offset = 0
+        for lo, hi in self._segments():
+            try:
+                return offset + self.buf.index(value, lo, hi) - lo
+            except (ValueError, TypeError):
+                offset += hi - lo
+        print("такого нет")
+        return -1
+
+
+def bytes_per_element(arr):
+    if arr.typecode is None:
+        total = sys.getsizeof(arr.array) + sum(sys.getsizeof(x) for x in arr.array)
+    else:
+        total = sys.getsizeof(arr.array)
+    return total / len(arr.array)
+
+
+def benchmark_modes(n=1000000, lookups=20):
+    print(f"\nСравнение режимов на {n} элементах:")
+    print(f"{'Режим':<10} {'байт/эл':>8} {'pushBack, эл/с':>15} {'extend, эл/с':>14} {'find, эл/с':>14}")
+
+    for typecode in (None, 'q', 'd'):
+        arr = Array_Edit(typecode)
+        t = time.perf_counter()
+        for i in range(n):
+            arr.pushBack(i)
+        push_time = time.perf_counter() - t
+
+        bulk = Array_Edit(typecode)
+        t = time.perf_counter()
+        bulk.extend(range(n))
+        extend_time = time.perf_counter() - t
+
+        # ищем элемент в конце массива, чтобы пройти его целиком
+        t = time.perf_counter()
+        for _ in range(lookups):
+            arr.find(n - 1)
+        find_time = time.perf_counter() - t
+
+        name = 'list' if typecode is None else f"array '{typecode}'"
+        print(f"{name:<10} {bytes_per_element(arr):>8.1f} {n / push_time:>15,.0f} "
+              f"{n / extend_time:>14,.0f} {lookups * n / find_time:>14,.0f}")
+
+
+
+def benchmark_layouts(n=50000, seed=1):
+    print(f"\nВставки в начало/конец/середину, {n} операций:")
+    print(f"{'Нагрузка':<16} {'list, с':>9} {'GapArray, с':>12}")
+
+    def front_back(arr, insert_mid):
+        for i in range(n):
+            if i % 2:
+                arr.pushFront(i)
+            else:
+                arr.pushBack(i)
+
+    def clustered(arr, insert_mid):
+        # вставки кучкуются вокруг середины
+        for i in range(n):
+            insert_mid(arr, len(arr) // 2, i)
+
+    def mixed(arr, insert_mid):
+        # операции идут пачками одного вида: разрыв переезжает раз на пачку
+        rnd = random.Random(seed)
+        i = 0
+        while i < n:
+            op = rnd.random()
+            burst = min(rnd.randint(1, 32), n - i)
+            if op < 0.4:
+                for j in range(burst):
+                    arr.pushFront(i + j)
+            elif op < 0.8:
+                for j in range(burst):
+                    arr.pushBack(i + j)
+            else:
+                cursor = rnd.randint(0, len(arr))
+                for j in range(burst):
+                    insert_mid(arr, cursor, i + j)
+            i += burst
+
+    workloads = [("начало/конец", front_back), ("середина", clustered), ("смешанная", mixed)]
+    for name, workload in workloads:
+        arr = Array_Edit()
+        t = time.perf_counter()
+        workload(arr, lambda a, k, v: a.array.insert(k, v))
+        list_time = time.perf_counter() - t
+
+        gap = GapArray()
+        t = time.perf_counter()
+        workload(gap, lambda a, k, v: a.insert_at(k, v))
+        gap_time = time.perf_counter() - t
+
+        print(f"{name:<16} {list_time:>9.4f} {gap_time:>12.4f}")
+
+
+
+def benchmark_index(n=200000, lookups=2000, seed=1):
+    print(f"\nИндекс значений для find, {n} элементов:")
+    rnd = random.Random(seed)
+    targets = [rnd.randrange(n) for _ in range(lookups)]
+
+    print(f"{'Режим':<12} {'pushBack, с':>12} {'find, мкс':>10} {'индекс, байт/эл':>16}")
+    for indexed in (False, True):
+        arr = Array_Edit('q', indexed=indexed)
+        t = time.perf_counter()
+        for i in range(n):
+            arr.pushBack(i)
+        build_time = time.perf_counter() - t
+
+        t = time.perf_counter()
+        for value in targets:
+            arr.find(value)
+        find_time = time.perf_counter() - t
+
+        name = 'с индексом' if indexed else 'без индекса'
+        print(f"{name:<12} {build_time:>12.4f} {find_time / lookups * 1e6:>10.2f} "
+              f"{arr.index_memory() / n:>16.1f}")
+
+
 if __name__ == '__main__':
     arr = Array_Edit()
 
@@ -49,3 +461,7 @@ if __name__ == '__main__':
     print(arr.array)
     index=arr.find(value=input('Введите значение для поиска: ')) 
     print(index)
+
+    benchmark_modes()
+    benchmark_layouts()
+    benchmark_index()
@@ -1,4 +1,6 @@
 import time
+import tracemalloc
+from itertools import repeat
 
 class Static:
     def __init__(self):
@@ -23,6 +25,127 @@ class Dynamic:
         self.arr[self.size] = x
         self.size += 1
 
+# Политики роста: по текущей ёмкости и нужному размеру возвращают новую ёмкость
+
+class FactorGrowth:
+
+    def __init__(self, factor=2.0):
+        self.factor = factor
+
+    def __call__(self, cap, needed):
+        return max(needed, int(cap * self.factor) + 1)
+
+    def __str__(self):
+        return f"x{self.factor}"
+
+
+class ChunkGrowth:
+
+    def __init__(self, chunk=1024):
+        self.chunk = chunk
+
+    def __call__(self, cap, needed):
+        return max(needed, cap + self.chunk)
+
+    def __str__(self):
+        return f"+{self.chunk}"
+
+
+class GrowableArray:
+    """Динамический массив с настраиваемым ростом и сжатием"""
+
+    def __init__(self, growth=None, min_cap=4, shrink_at=0.25):
+        self.growth = growth if growth else FactorGrowth(2.0)
+        self.min_cap = min_cap
+        # сжимаемся, когда заполнено меньше shrink_at ёмкости, и только вдвое -
+        # запас между порогами не даёт массиву дёргаться на границе
+        self.shrink_at = shrink_at
+        self.arr = [None] * min_cap
+        self.size = 0
+        self.cap = min_cap
+        self.resizes = 0
+        self.copied = 0
+        self.max_resize_time = 0.0
+
+    def __len__(self):
+        return self.size
+
+    def __getitem__(self, index):
+        if not 0 <= index < self.size:
+            raise IndexError("Индекс вне диапазона")
+        return self.arr[index]
+
+    def add(self, x):
+        if self.size == self.cap:
+            self._resize(self.growth(self.cap, self.size + 1))
+        self.arr[self.size] = x
+        self.size += 1
+
+    def pop(self):
+        if self.size == 0:
+            raise IndexError("Массив пуст")
+        self.size -= 1
+        x = self.arr[self.size]
+        self.arr[self.size] = None
+        if self.cap > self.min_cap and self.size < self.cap * self.shrink_at:
+            self._resize(max(self.min_cap, self.cap // 2))
+        return x
+
+    def reserve(self, n):
+        if n > self.cap:
+            self._resize(n)
+
+    def shrink_to_fit(self):
+        self._resize(max(self.min_cap, self.size))
+
+    def _resize(self, new_cap):
+        t = time.perf_counter()
+        # меняем список на месте, без временного [0] * k
+        if new_cap > self.cap:
+            self.arr.extend(repeat(None, new_cap - self.cap))
+        else:
+            del self.arr[new_cap:]
+        self.cap = new_cap
+        self.resizes += 1
+        self.copied += self.size
+        self.max_resize_time = max(self.max_resize_time, time.perf_counter() - t)
+
+
+def wave_workload(arr, peak, waves):
+    # растём до peak, опускаемся до десятой части, и так несколько волн
+    ops = 0
+    for _ in range(waves):
+        while len(arr) < peak:
+            arr.add(ops)
+            ops += 1
+        while len(arr) > peak // 10:
+            arr.pop()
+            ops += 1
+    return ops
+
+
+def benchmark_policies(peak=200000, waves=5):
+    print(f"\nПолитики роста, {waves} волн до {peak} элементов:")
+    print(f"{'Политика':<10} {'время, с':>9} {'копий/оп':>9} {'ресайзов':>9} "
+          f"{'макс. ресайз, мс':>17} {'пик памяти, КБ':>15}")
+
+    policies = [FactorGrowth(1.5), FactorGrowth(2.0), ChunkGrowth(1024), ChunkGrowth(16384)]
+    for policy in policies:
+        arr = GrowableArray(policy)
+        t = time.perf_counter()
+        ops = wave_workload(arr, peak, waves)
+        total = time.perf_counter() - t
+
+        # память меряем отдельным прогоном: tracemalloc замедляет выделения
+        tracemalloc.start()
+        wave_workload(GrowableArray(policy), peak, waves)
+        peak_mem = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        print(f"{str(policy):<10} {total:>9.4f} {arr.copied / ops:>9.3f} {arr.resizes:>9} "
+              f"{arr.max_resize_time * 1000:>17.3f} {peak_mem / 1024:>15.0f}")
+
+
 print("Тест 100000 элементов...")
 
 t1 = time.time()
@@ -37,3 +160,5 @@ dynamic_time = time.time() - t2
 
 print(f"Статический:  {static_time:.4f}с")
 print(f"Динамический: {dynamic_time:.4f}с")
+
+benchmark_policies()
\ No newline at end of file
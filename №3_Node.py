@@ -1,3 +1,8 @@
+import random
+import time
+import tracemalloc
+
+
 class Node:
     def __init__(self, value):
         self.value = value 
@@ -54,6 +59,303 @@ class LinkedList:
             cur.next = prev 
             cur = nxt
         self.head = prev 
+
+    def print_list(self):
+        values = []
+        cur = self.head
+        while cur is not None:
+            values.append(str(cur.value))
+            cur = cur.next
+        print(" -> ".join(values))
+
+
+class UnrolledNode:
+    def __init__(self, values=None):
+        self.values = values if values is not None else []
+        self.next = None
+
+
+class UnrolledLinkedList:
+    # в каждом узле до capacity значений: меньше объектов и переходов по ссылкам
+
+    def __init__(self, capacity=64):
+        # полный узел делится пополам, и при capacity=1 одна из половин была бы пустой
+        if capacity < 2:
+            raise ValueError(f"capacity должна быть не меньше 2, передано {capacity}")
+        self.capacity = capacity
+        self.head = None
+        self.tail = None
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def __iter__(self):
+        cur = self.head
+        while cur is not None:
+            yield from cur.values
+            cur = cur.next
+
+    def push_front(self, value):
+        if self.head is None or len(self.head.values) == self.capacity:
+            node = UnrolledNode()
+            node.next = self.head
+            self.head = node
+            if self.tail is None:
+                self.tail = node
+        self.head.values.insert(0, value)
+        self.size += 1
+
+    def push_back(self, value):
+        if self.tail is None or len(self.tail.values) == self.capacity:
+            node = UnrolledNode()
+            if self.tail is None:
+                self.head = node
+            else:
+                self.tail.next = node
+            self.tail = node
+        self.tail.values.append(value)
+        self.size += 1
+
+    def insert(self, index, value):
+        if index <= 0:
+            return self.push_front(value)
+        if index >= self.size:
+            return self.push_back(value)
+        cur = self.head
+        while index > len(cur.values):
+            index -= len(cur.values)
+            cur = cur.next
+        if len(cur.values) == self.capacity:
+            # полный узел делим пополам
+            self._split(cur)
+            if index > len(cur.values):
+                index -= len(cur.values)
+                cur = cur.next
+        cur.values.insert(index, value)
+        self.size += 1
+
+    def _split(self, node):
+        half = len(node.values) // 2
+        new_node = UnrolledNode(node.values[half:])
+        del node.values[half:]
+        new_node.next = node.next
+        node.next = new_node
+        if self.tail is node:
+            self.tail = new_node
+
+    def remove(self, value):
+        cur = self.head
+        prev = None
+        while cur is not None:
+            if value in cur.values:
+                cur.values.remove(value)
+                self.size -= 1
+                self._rebalance(prev, cur)
+                return
+            prev = cur
+            cur = cur.next
+
+    # узел, опустевший меньше чем наполовину, сливаем со следующим
+    # или забираем у следующего часть значений
+    def _rebalance(self, prev, node):
+        if not node.values:
+            if prev is None:
+                self.head = node.next
+            else:
+                prev.next = node.next
+            if self.tail is node:
+                self.tail = prev
+            return
+        nxt = node.next
+        if nxt is None or len(node.values) >= self.capacity // 2:
+            return
+        if len(node.values) + len(nxt.values) <= self.capacity:
+            node.values.extend(nxt.values)
+            node.next = nxt.next
+            if self.tail is nxt:
+                self.tail = node
+        else:
+            take = (len(nxt.values) - len(node.values)) // 2
+            node.values.extend(nxt.values[:take])
+            del nxt.values[:take]
+
+    def find(self, value):
+        cur = self.head
+        while cur is not None:
+            if value in cur.values:
+                return True
+            cur = cur.next
+        return False
+
+    def reverse(self):
+        prev = None
+        cur = self.head
+        self.tail = cur
+        while cur is not None:
+            cur.values.reverse()
+            nxt = cur.next
+            cur.next = prev
+            prev = cur
+            cur = nxt
+        self.head = prev
+
+    def print_list(self):
+        print(" -> ".join(str(value) for value in self))
+
+
+class SkipNode:
+    def __init__(self, value, level):
+        self.value = value
+        self.next = [None] * level
+
+
+class SkipList:
+    # отсортированный список с "экспресс-полосами": поиск, вставка и удаление за O(log n) в среднем
+
+    def __init__(self, p=0.5, max_level=32, seed=None):
+        self.p = p
+        self.max_level = max_level
+        self.random = random.Random(seed)
+        self.head = SkipNode(None, max_level)
+        self.level = 1
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def __iter__(self):
+        cur = self.head.next[0]
+        while cur is not None:
+            yield cur.value
+            cur = cur.next[0]
+
+    def _random_level(self):
+        level = 1
+        while level < self.max_level and self.random.random() < self.p:
+            level += 1
+        return level
+
+    # последний узел меньше value на каждом уровне
+    def _predecessors(self, value):
+        update = [self.head] * self.max_level
+        cur = self.head
+        for i in range(self.level - 1, -1, -1):
+            nxt = cur.next[i]
+            while nxt is not None and nxt.value < value:
+                cur = nxt
+                nxt = cur.next[i]
+            update[i] = cur
+        return update
+
+    def insert(self, value):
+        update = self._predecessors(value)
+        nxt = update[0].next[0]
+        if nxt is not None and nxt.value == value:
+            return False
+        level = self._random_level()
+        self.level = max(self.level, level)
+        node = SkipNode(value, level)
+        for i in range(level):
+            node.next[i] = update[i].next[i]
+            update[i].next[i] = node
+        self.size += 1
+        return True
+
+    def remove(self, value):
+        update = self._predecessors(value)
+        node = update[0].next[0]
+        if node is None or node.value != value:
+            return False
+        for i in range(len(node.next)):
+            update[i].next[i] = node.next[i]
+        while self.level > 1 and self.head.next[self.level - 1] is None:
+            self.level -= 1
+        self.size -= 1
+        return True
+
+    def find(self, value):
+        cur = self.head
+        for i in range(self.level - 1, -1, -1):
+            nxt = cur.next[i]
+            while nxt is not None and nxt.value < value:
+                cur = nxt
+                nxt = cur.next[i]
+        nxt = cur.next[0]
+        return nxt is not None and nxt.value == value
+
+    def __contains__(self, value):
+        return self.find(value)
+
+    # значения из [lo, hi) по порядку
+    def iter_range(self, lo, hi):
+        cur = self._predecessors(lo)[0].next[0]
+        while cur is not None and cur.value < hi:
+            yield cur.value
+            cur = cur.next[0]
+
+
+def benchmark_skip_list(n=100000, lookups=100000, seed=1):
+    print(f"\nSkipList на {n} ключах:")
+    rnd = random.Random(seed)
+    keys = rnd.sample(range(n * 10), n)
+
+    for p in (0.25, 0.5):
+        sl = SkipList(p=p, seed=seed)
+        t = time.perf_counter()
+        for key in keys:
+            sl.insert(key)
+        insert_time = time.perf_counter() - t
+
+        probes = [rnd.randrange(n * 10) for _ in range(lookups)]
+        t = time.perf_counter()
+        hits = sum(1 for key in probes if sl.find(key))
+        find_time = time.perf_counter() - t
+
+        t = time.perf_counter()
+        for key in keys[:lookups // 10]:
+            sl.remove(key)
+        remove_time = time.perf_counter() - t
+
+        print(f"p={p}: вставка {n / insert_time:,.0f} оп/с, поиск {lookups / find_time:,.0f} оп/с "
+              f"(найдено {hits}), удаление {lookups // 10 / remove_time:,.0f} оп/с")
+
+    lst = LinkedList()
+    for key in keys:
+        lst.push_front(key)
+    t = time.perf_counter()
+    for key in probes[:100]:
+        lst.find(key)
+    print(f"LinkedList.find: {100 / (time.perf_counter() - t):,.0f} оп/с")
+
+
+def benchmark_lists(n=100000):
+    print(f"\nLinkedList и UnrolledLinkedList, {n} элементов:")
+    print(f"{'Список':<20} {'байт/эл':>8} {'push_back, с':>13} {'find, с':>8}")
+
+    for cls in (LinkedList, UnrolledLinkedList):
+        lst = cls()
+        # у LinkedList push_back обходит всю цепочку, поэтому заполняем с начала;
+        # малые числа закешированы, так что меряется только сама структура
+        tracemalloc.start()
+        for i in range(n):
+            lst.push_front(i % 256)
+        memory = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+
+        t = time.perf_counter()
+        for i in range(1000):
+            lst.push_back(i)
+        push_time = time.perf_counter() - t
+
+        t = time.perf_counter()
+        for _ in range(10):
+            lst.find(-1)
+        find_time = time.perf_counter() - t
+
+        print(f"{cls.__name__:<20} {memory / n:>8.1f} {push_time:>13.4f} {find_time:>8.4f}")
+
+
 if __name__ == '__main__':
     lst = LinkedList()
     lst.push_front(2)
@@ -70,4 +372,7 @@ if __name__ == '__main__':
 
     lst.reverse()
     lst.print_list() 
-    #В массиве вставка/удаление в начале и середине медленные, а в односвязном списке — быстрые, но поиск медленный.
\ No newline at end of file
+    #В массиве вставка/удаление в начале и середине медленные, а в односвязном списке — быстрые, но поиск медленный.
+
+    benchmark_lists()
+    benchmark_skip_list()
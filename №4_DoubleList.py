@@ -1,3 +1,11 @@
+from array import array
+from functools import lru_cache
+import gc
+import random
+import time
+import tracemalloc
+
+
 class Node:
     def __init__(self, value):
         self.value = value
@@ -73,10 +81,345 @@ class DoublyLinkedList:
         else:
             self.tail = node.prev
 
+    # вставить в начало уже существующий отцепленный узел, без нового Node
+    def push_node_front(self, node):
+        node.prev = None
+        node.next = self.head
+        if self.head:
+            self.head.prev = node
+        else:
+            self.tail = node
+        self.head = node
+
+    def move_to_front(self, node):
+        if node is not self.head:
+            self.delete_node(node)
+            self.push_node_front(node)
+
     def __iter__(self):
         return DLLIterator(self.head)
 
 
+NIL = -1    # нет соседа
+FREE = -2   # слот в списке свободных
+
+
+class PooledDoublyLinkedList:
+    """Двусвязный список на параллельных массивах: узел - это номер слота"""
+
+    def __init__(self, capacity=16):
+        self.values = [None] * capacity
+        self.prev = array('q', [NIL]) * capacity
+        self.next = array('q', [NIL]) * capacity
+        self.head = NIL
+        self.tail = NIL
+        self.size = 0
+        # свободные слоты связаны через next
+        self.free = NIL
+        self._link_free(0, capacity)
+
+    def _link_free(self, lo, hi):
+        for slot in range(hi - 1, lo - 1, -1):
+            self.prev[slot] = FREE
+            self.next[slot] = self.free
+            self.free = slot
+
+    def _alloc(self, value):
+        if self.free == NIL:
+            # удвоение; пул с capacity=0 растёт хотя бы на один слот
+            cap = len(self.values)
+            grow = max(cap, 1)
+            self.values.extend([None] * grow)
+            self.prev.extend(array('q', [NIL]) * grow)
+            self.next.extend(array('q', [NIL]) * grow)
+            self._link_free(cap, cap + grow)
+        slot = self.free
+        self.free = self.next[slot]
+        self.values[slot] = value
+        self.size += 1
+        return slot
+
+    def __len__(self):
+        return self.size
+
+    def _check_live(self, handle):
+        if self.prev[handle] == FREE:
+            raise KeyError(f"Узел {handle} уже удалён")
+
+    def value(self, handle):
+        self._check_live(handle)
+        return self.values[handle]
+
+    def append(self, value):
+        return self.insert_after(self.tail, value)
+
+    # handle=NIL - вставка в начало, как node=None у DoublyLinkedList
+    def insert_after(self, handle, value):
+        # проверка до _alloc: освобождённый handle мог бы достаться новому узлу
+        if handle != NIL:
+            self._check_live(handle)
+        slot = self._alloc(value)
+        if handle == NIL:
+            nxt = self.head
+            self.head = slot
+        else:
+            nxt = self.next[handle]
+            self.next[handle] = slot
+        self.prev[slot] = handle
+        self.next[slot] = nxt
+        if nxt == NIL:
+            self.tail = slot
+        else:
+            self.prev[nxt] = slot
+        return slot
+
+    def delete_node(self, handle):
+        prv, nxt = self.prev[handle], self.next[handle]
+        if prv == FREE:
+            raise KeyError(f"Узел {handle} уже удалён")
+        if prv == NIL:
+            self.head = nxt
+        else:
+            self.next[prv] = nxt
+        if nxt == NIL:
+            self.tail = prv
+        else:
+            self.prev[nxt] = prv
+
+        self.values[handle] = None
+        self.prev[handle] = FREE
+        self.next[handle] = self.free
+        self.free = handle
+        self.size -= 1
+
+    def __iter__(self):
+        slot = self.head
+        while slot != NIL:
+            yield self.values[slot]
+            slot = self.next[slot]
+
+
+def churn(lst, none, n, ops, seed):
+    # держим n узлов и на каждом шаге удаляем случайный и вставляем новый
+    rnd = random.Random(seed)
+    handles = [lst.append(i) for i in range(n)]
+    for i in range(ops):
+        k = rnd.randrange(n)
+        lst.delete_node(handles[k])
+        j = rnd.randrange(n)
+        handles[k] = lst.insert_after(none if j == k else handles[j], i)
+
+
+def benchmark_churn(n=10000, ops=300000, seed=1):
+    print(f"\nЧёрн {ops} удалений/вставок при {n} узлах:")
+    print(f"{'Список':<24} {'время, с':>9} {'сборок gen0':>12} {'байт/узел':>10} {'gc.collect, мс':>15}")
+
+    for cls, none in ((DoublyLinkedList, None), (PooledDoublyLinkedList, NIL)):
+        lst = cls()
+        before = gc.get_stats()[0]['collections']
+        t = time.perf_counter()
+        churn(lst, none, n, ops, seed)
+        total = time.perf_counter() - t
+        collections = gc.get_stats()[0]['collections'] - before
+
+        # память самой структуры и цена полной сборки, пока узлы живы;
+        # значения - закешированные малые числа
+        tracemalloc.start()
+        big = cls()
+        for i in range(n * 10):
+            big.append(i % 256)
+        memory = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        # первая сборка убирает циклы от прошлых прогонов, меряем вторую
+        gc.collect()
+        t = time.perf_counter()
+        gc.collect()
+        collect_time = time.perf_counter() - t
+
+        print(f"{cls.__name__:<24} {total:>9.4f} {collections:>12} "
+              f"{memory / (n * 10):>10.1f} {collect_time * 1000:>15.2f}")
+
+
+class CacheEntry:
+    def __init__(self, key, value, weight):
+        self.key = key
+        self.value = value
+        self.weight = weight
+        self.freq = 1
+
+
+class Cache:
+    """LRU/LFU-кэш: словарь ключ -> узел DoublyLinkedList, все операции O(1)"""
+
+    def __init__(self, max_size=128, max_weight=None, weigher=None, policy='lru', on_evict=None):
+        if policy not in ('lru', 'lfu'):
+            raise ValueError(f"Неизвестная политика: {policy}")
+        # put не выселяет только что записанный ключ, так что меньше одного места не бывает
+        if max_size < 1:
+            raise ValueError(f"max_size должен быть не меньше 1, передано {max_size}")
+        self.max_size = max_size
+        self.max_weight = max_weight
+        self.weigher = weigher if weigher else (lambda key, value: 1)
+        self.policy = policy
+        self.on_evict = on_evict
+        self.nodes = {}
+        self.weight = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # lru: один список, в голове самые свежие;
+        # lfu: список на каждую частоту, внутри частоты - тоже по свежести
+        self.order = DoublyLinkedList()
+        self.buckets = {}
+        self.min_freq = 0
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def __contains__(self, key):
+        return key in self.nodes
+
+    def _touch(self, node):
+        if self.policy == 'lru':
+            self.order.move_to_front(node)
+            return
+        entry = node.value
+        bucket = self.buckets[entry.freq]
+        bucket.delete_node(node)
+        if bucket.head is None:
+            del self.buckets[entry.freq]
+            if self.min_freq == entry.freq:
+                self.min_freq += 1
+        entry.freq += 1
+        self._bucket(entry.freq).push_node_front(node)
+
+    def _bucket(self, freq):
+        bucket = self.buckets.get(freq)
+        if bucket is None:
+            bucket = self.buckets[freq] = DoublyLinkedList()
+        return bucket
+
+    def _unlink(self, node):
+        entry = node.value
+        if self.policy == 'lru':
+            self.order.delete_node(node)
+        else:
+            bucket = self.buckets[entry.freq]
+            bucket.delete_node(node)
+            if bucket.head is None:
+                del self.buckets[entry.freq]
+        del self.nodes[entry.key]
+        self.weight -= entry.weight
+
+    def _victim(self):
+        if self.policy == 'lru':
+            return self.order.tail
+        return self.buckets[self.min_freq].tail
+
+    def get(self, key, default=None):
+        node = self.nodes.get(key)
+        if node is None:
+            self.misses += 1
+            return default
+        self.hits += 1
+        self._touch(node)
+        return node.value.value
+
+    def put(self, key, value):
+        weight = self.weigher(key, value)
+        if self.max_weight is not None and weight > self.max_weight:
+            # такой элемент не влезет даже в пустой кэш
+            self.delete(key)
+            return False
+
+        node = self.nodes.get(key)
+        if node is not None:
+            entry = node.value
+            self.weight += weight - entry.weight
+            entry.value = value
+            entry.weight = weight
+            self._touch(node)
+        else:
+            entry = CacheEntry(key, value, weight)
+            node = Node(entry)
+            if self.policy == 'lru':
+                self.order.push_node_front(node)
+            else:
+                self._bucket(1).push_node_front(node)
+                self.min_freq = 1
+            self.nodes[key] = node
+            self.weight += weight
+
+        while (len(self.nodes) > self.max_size or
+               (self.max_weight is not None and self.weight > self.max_weight)):
+            self._evict(node)
+        return True
+
+    # выселяем жертву политики; только что записанный ключ не трогаем
+    def _evict(self, keep):
+        victim = self._victim()
+        if victim is keep:
+            victim = victim.prev
+            if victim is None and self.policy == 'lfu':
+                freq = min(f for f in self.buckets if f != keep.value.freq)
+                victim = self.buckets[freq].tail
+        self._unlink(victim)
+        if self.policy == 'lfu' and self.min_freq not in self.buckets and self.buckets:
+            self.min_freq = min(self.buckets)
+        self.evictions += 1
+        if self.on_evict:
+            self.on_evict(victim.value.key, victim.value.value)
+
+    def delete(self, key):
+        node = self.nodes.get(key)
+        if node is None:
+            return False
+        self._unlink(node)
+        if self.policy == 'lfu' and self.min_freq not in self.buckets and self.buckets:
+            self.min_freq = min(self.buckets)
+        return True
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / total if total else 0.0,
+            'size': len(self.nodes),
+            'weight': self.weight,
+        }
+
+
+def benchmark_cache(n=200000, keys=10000, max_size=1000, seed=1):
+    print(f"\nКэш на {max_size} ключей, {n} запросов к {keys} ключам (распределение Ципфа):")
+    rnd = random.Random(seed)
+    weights = [1 / (k + 1) for k in range(keys)]
+    requests = rnd.choices(range(keys), weights, k=n)
+
+    def lookup(key):
+        return key * 2
+
+    for policy in ('lru', 'lfu'):
+        cache = Cache(max_size=max_size, policy=policy)
+        t = time.perf_counter()
+        for key in requests:
+            if cache.get(key) is None:
+                cache.put(key, lookup(key))
+        total = time.perf_counter() - t
+        st = cache.stats()
+        print(f"{'Cache ' + policy:<20} {n / total:>12,.0f} оп/с, попаданий {st['hit_rate']:.1%}, "
+              f"выселено {st['evictions']}")
+
+    cached = lru_cache(maxsize=max_size)(lookup)
+    t = time.perf_counter()
+    for key in requests:
+        cached(key)
+    total = time.perf_counter() - t
+    info = cached.cache_info()
+    print(f"{'functools.lru_cache':<20} {n / total:>12,.0f} оп/с, попаданий {info.hits / n:.1%}")
+
+
 if __name__ == "__main__":
     lst = DoublyLinkedList()
 
@@ -91,8 +434,11 @@ if __name__ == "__main__":
     for x in lst:
         print(x)
 
-    lst.delete(n2)
+    lst.delete_node(n2)
 
     print("Список после удаления 2:")
     for x in lst:
-        print(x)
\ No newline at end of file
+        print(x)
+
+    benchmark_churn()
+    benchmark_cache()
@@ -1,4 +1,11 @@
 
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+import os
+import re
+import tempfile
+import time
+
 # Стек на массиве
 
 class ArrayStack:
@@ -70,6 +77,89 @@ def check_brackets(expression):
     return stack.is_empty()
 
 
+# Потоковая проверка: файл читается кусками, в памяти только стек
+
+BRACKETS = b"()[]{}"
+NOT_BRACKETS = bytes(b for b in range(256) if b not in BRACKETS)
+BRACKET_RE = re.compile(rb"[()\[\]{}]")
+BYTE_PAIRS = {ord(')'): ord('('), ord(']'): ord('['), ord('}'): ord('{')}
+
+
+# номер первой неверной скобки в последовательности из одних скобок или -1
+def _feed(stack, brackets):
+    for i, ch in enumerate(brackets):
+        if ch in BYTE_PAIRS:
+            if stack.is_empty() or stack.pop() != BYTE_PAIRS[ch]:
+                return i
+        else:
+            stack.push(ch)
+    return -1
+
+
+def check_brackets_stream(source, chunk_size=1 << 20, stack_class=ArrayStack):
+    """Возвращает (True, None) или (False, смещение первой ошибки в байтах)"""
+    stack = stack_class()
+    own = isinstance(source, (str, os.PathLike))
+    f = open(source, 'rb') if own else source
+    offset = 0
+    try:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            # остальные символы выкидываем на уровне C, цикл идёт только по скобкам
+            bad = _feed(stack, chunk.translate(None, NOT_BRACKETS))
+            if bad != -1:
+                match = next(islice(BRACKET_RE.finditer(chunk), bad, None))
+                return False, offset + match.start()
+            offset += len(chunk)
+    finally:
+        if own:
+            f.close()
+    if stack.is_empty():
+        return True, None
+    return False, offset
+
+
+def check_brackets_batch(expressions, workers=None, chunksize=1000):
+    # короткие строки раздаются процессам пачками, чтобы не платить за каждую
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(check_brackets, expressions, chunksize=chunksize))
+
+
+def benchmark_brackets(size_mb=20, snippets=200000):
+    print(f"\nПроверка скобок в файле {size_mb} МБ:")
+    block = b'{"items": [{"id": 1, "tags": ["a", "b"], "f": (x + y) * [z]}], "n": {}}\n'
+    with tempfile.NamedTemporaryFile(suffix='.json', delete=False) as f:
+        f.write(block * (size_mb * (1 << 20) // len(block)))
+        path = f.name
+    try:
+        size = os.path.getsize(path)
+        for stack_class in (ArrayStack, LinkedListStack):
+            t = time.perf_counter()
+            ok, _ = check_brackets_stream(path, stack_class=stack_class)
+            total = time.perf_counter() - t
+            print(f"{stack_class.__name__:<16} {size / total / (1 << 20):>8.1f} МБ/с  ({ok})")
+
+        with open(path) as f:
+            text = f.read()
+        t = time.perf_counter()
+        check_brackets(text)
+        total = time.perf_counter() - t
+        print(f"{'check_brackets':<16} {size / total / (1 << 20):>8.1f} МБ/с  (вся строка в памяти)")
+    finally:
+        os.remove(path)
+
+    print(f"\nПакет из {snippets} коротких выражений:")
+    exprs = ["([]{})" * 5, "([)]", "((()))" * 3, "())("] * (snippets // 4)
+    t = time.perf_counter()
+    [check_brackets(e) for e in exprs]
+    print(f"Последовательно: {time.perf_counter() - t:.3f} с")
+    t = time.perf_counter()
+    check_brackets_batch(exprs)
+    print(f"Пул процессов ({os.cpu_count()}): {time.perf_counter() - t:.3f} с")
+
+
 if __name__ == "__main__":
     tests = ["()", "([]{})", "([)]", "((()))", "(", "())("]
     for t in tests:
@@ -89,4 +179,6 @@ if __name__ == "__main__":
     s2.push(200)
     print("Верхний элемент:", s2.top())
     print("Извлечён:", s2.pop())
-    print("Верхний элемент:", s2.top())
\ No newline at end of file
+    print("Верхний элемент:", s2.top())
+
+    benchmark_brackets()
@@ -1,3 +1,10 @@
+from collections import deque
+import asyncio
+import queue
+import threading
+import time
+
+
 class CircularQueue:
     """Очередь на циклическом массиве"""
     
@@ -91,6 +98,461 @@ class QueueTwoStacks:
         return f"Входной стек: {self.stack_in}, Выходной стек: {self.stack_out}"
 
 
+class BlockingCircularQueue:
+    """Ограниченная потокобезопасная очередь на циклическом массиве"""
+
+    def __init__(self, capacity=1024):
+        self.capacity = capacity
+        self.queue = [None] * capacity
+        self.front = 0
+        self.rear = 0
+        self.size = 0
+        self.lock = threading.Lock()
+        self.not_empty = threading.Condition(self.lock)
+        self.not_full = threading.Condition(self.lock)
+
+    def is_empty(self):
+        return self.size == 0
+
+    def is_full(self):
+        return self.size == self.capacity
+
+    # запись и чтение пачкой: не больше двух срезов, без модуля на каждый элемент
+    def _write(self, items):
+        k = len(items)
+        first = min(k, self.capacity - self.rear)
+        self.queue[self.rear:self.rear + first] = items[:first]
+        self.queue[:k - first] = items[first:]
+        self.rear = (self.rear + k) % self.capacity
+        self.size += k
+
+    def _read(self, k):
+        first = min(k, self.capacity - self.front)
+        items = self.queue[self.front:self.front + first] + self.queue[:k - first]
+        self.queue[self.front:self.front + first] = [None] * first
+        self.queue[:k - first] = [None] * (k - first)
+        self.front = (self.front + k) % self.capacity
+        self.size -= k
+        return items
+
+    def put(self, item, block=True, timeout=None):
+        with self.not_full:
+            if self.size == self.capacity:
+                if not block or not self.not_full.wait_for(lambda: self.size < self.capacity, timeout):
+                    raise queue.Full
+            self.queue[self.rear] = item
+            self.rear = (self.rear + 1) % self.capacity
+            self.size += 1
+            self.not_empty.notify()
+
+    def get(self, block=True, timeout=None):
+        with self.not_empty:
+            if self.size == 0:
+                if not block or not self.not_empty.wait_for(lambda: self.size > 0, timeout):
+                    raise queue.Empty
+            item = self.queue[self.front]
+            self.queue[self.front] = None
+            self.front = (self.front + 1) % self.capacity
+            self.size -= 1
+            self.not_full.notify()
+            return item
+
+    def put_many(self, items, timeout=None):
+        """Кладёт элементы, ожидая места; возвращает, сколько успело войти до таймаута"""
+        items = list(items)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        done = 0
+        with self.not_full:
+            while done < len(items):
+                if self.size == self.capacity:
+                    left = None if deadline is None else deadline - time.monotonic()
+                    if not self.not_full.wait_for(lambda: self.size < self.capacity, left):
+                        break
+                k = min(self.capacity - self.size, len(items) - done)
+                self._write(items[done:done + k])
+                done += k
+                self.not_empty.notify(k)
+        return done
+
+    def get_many(self, max_items, timeout=None):
+        """Ждёт хотя бы один элемент и забирает до max_items; по таймауту - пустой список"""
+        with self.not_empty:
+            if self.size == 0 and not self.not_empty.wait_for(lambda: self.size > 0, timeout):
+                return []
+            k = min(self.size, max_items)
+            items = self._read(k)
+            self.not_full.notify(k)
+            return items
+
+
+class SPSCCircularQueue:
+    """Очередь для одного писателя и одного читателя: блокировка только на ожидании"""
+
+    # Держится на GIL: запись слота и счётчика атомарны, tail меняет только
+    # писатель, head - только читатель. Ждущая сторона ставит флаг под блокировкой
+    # и перепроверяет условие, другая будит её, только если флаг стоит.
+
+    def __init__(self, capacity=1024):
+        self.capacity = capacity
+        self.queue = [None] * capacity
+        self.head = 0
+        self.tail = 0
+        self.lock = threading.Lock()
+        self.not_empty = threading.Condition(self.lock)
+        self.not_full = threading.Condition(self.lock)
+        self.getter_waiting = False
+        self.putter_waiting = False
+
+    def is_empty(self):
+        return self.head == self.tail
+
+    def _wait_space(self, timeout):
+        with self.not_full:
+            self.putter_waiting = True
+            try:
+                return self.not_full.wait_for(lambda: self.tail - self.head < self.capacity, timeout)
+            finally:
+                self.putter_waiting = False
+
+    def _wait_items(self, timeout):
+        with self.not_empty:
+            self.getter_waiting = True
+            try:
+                return self.not_empty.wait_for(lambda: self.tail != self.head, timeout)
+            finally:
+                self.getter_waiting = False
+
+    def _wake_getter(self):
+        if self.getter_waiting:
+            with self.not_empty:
+                self.not_empty.notify()
+
+    def _wake_putter(self):
+        if self.putter_waiting:
+            with self.not_full:
+                self.not_full.notify()
+
+    def put(self, item, timeout=None):
+        if self.tail - self.head == self.capacity and not self._wait_space(timeout):
+            raise queue.Full
+        self.queue[self.tail % self.capacity] = item
+        self.tail += 1
+        self._wake_getter()
+
+    def get(self, timeout=None):
+        if self.tail == self.head and not self._wait_items(timeout):
+            raise queue.Empty
+        pos = self.head % self.capacity
+        item = self.queue[pos]
+        self.queue[pos] = None
+        self.head += 1
+        self._wake_putter()
+        return item
+
+    def put_many(self, items, timeout=None):
+        """Как у BlockingCircularQueue: ждёт места до общего срока и возвращает, сколько вошло"""
+        items = list(items)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        done = 0
+        while done < len(items):
+            free = self.capacity - (self.tail - self.head)
+            if free == 0:
+                left = None if deadline is None else max(deadline - time.monotonic(), 0)
+                if not self._wait_space(left):
+                    break
+                continue
+            k = min(free, len(items) - done)
+            pos = self.tail % self.capacity
+            first = min(k, self.capacity - pos)
+            self.queue[pos:pos + first] = items[done:done + first]
+            self.queue[:k - first] = items[done + first:done + k]
+            self.tail += k
+            done += k
+            self._wake_getter()
+        return done
+
+    def get_many(self, max_items, timeout=None):
+        if self.tail == self.head and not self._wait_items(timeout):
+            return []
+        k = min(self.tail - self.head, max_items)
+        pos = self.head % self.capacity
+        first = min(k, self.capacity - pos)
+        items = self.queue[pos:pos + first] + self.queue[:k - first]
+        self.queue[pos:pos + first] = [None] * first
+        self.queue[:k - first] = [None] * (k - first)
+        self.head += k
+        self._wake_putter()
+        return items
+
+
+class ByteRingBuffer:
+    """Кольцевой буфер байтов на bytearray: запись и чтение срезами, просмотр без копий"""
+
+    def __init__(self, capacity=1 << 16):
+        self.capacity = capacity
+        self.buf = bytearray(capacity)
+        # bytearray не растёт, поэтому один memoryview живёт всё время
+        self.view = memoryview(self.buf)
+        self.front = 0
+        self.size = 0
+
+    def is_empty(self):
+        return self.size == 0
+
+    def free(self):
+        return self.capacity - self.size
+
+    def write(self, data):
+        """Пишет сколько влезет из байтового буфера, возвращает число записанных байт"""
+        n = min(len(data), self.capacity - self.size)
+        rear = (self.front + self.size) % self.capacity
+        if n == len(data) and rear + n <= self.capacity:
+            self.buf[rear:rear + n] = data
+        else:
+            data = memoryview(data)
+            first = min(n, self.capacity - rear)
+            self.view[rear:rear + first] = data[:first]
+            self.view[:n - first] = data[first:n]
+        self.size += n
+        return n
+
+    def peek_view(self, n):
+        """До n байт из начала как один или два memoryview, без копирования"""
+        n = min(n, self.size)
+        first = min(n, self.capacity - self.front)
+        if first == n:
+            return (self.view[self.front:self.front + n],)
+        return (self.view[self.front:], self.view[:n - first])
+
+    def consume(self, n):
+        n = min(n, self.size)
+        self.front = (self.front + n) % self.capacity
+        self.size -= n
+        return n
+
+    def read_into(self, out):
+        """Копирует в out (bytearray или байтовый memoryview), возвращает число байт"""
+        n = min(len(out), self.size)
+        if self.front + n <= self.capacity:
+            out[:n] = self.view[self.front:self.front + n]
+        else:
+            first = self.capacity - self.front
+            out[:first] = self.view[self.front:]
+            out[first:n] = self.view[:n - first]
+        return self.consume(n)
+
+
+def benchmark_byte_ring(total=64 << 20, batch=16):
+    print(f"\nПеренос {total >> 20} МБ сообщениями, ГБ/с:")
+    print(f"{'Сообщение':>10} {'CircularQueue':>14} {'ByteRingBuffer':>15}")
+
+    for size in (64, 1024, 16384, 65536):
+        data = bytearray(size)
+        out = bytearray(size)
+        rounds = max(1, total // (size * batch))
+
+        # очередь объектов: каждое сообщение - отдельный bytes, как после recv()
+        q = CircularQueue(batch)
+        start = time.perf_counter()
+        for _ in range(rounds):
+            for _ in range(batch):
+                q.enqueue(bytes(data))
+            for _ in range(batch):
+                out[:] = q.dequeue()
+        queue_time = time.perf_counter() - start
+
+        ring = ByteRingBuffer(size * batch)
+        view = memoryview(out)
+        start = time.perf_counter()
+        for _ in range(rounds):
+            for _ in range(batch):
+                ring.write(data)
+            for _ in range(batch):
+                ring.read_into(view)
+        ring_time = time.perf_counter() - start
+
+        moved = rounds * batch * size / 1e9
+        print(f"{size:>9}B {moved / queue_time:>14.2f} {moved / ring_time:>15.2f}")
+
+
+class AsyncCircularQueue:
+    """Очередь для asyncio поверх CircularQueue: put ждёт, пока очередь выше high_water"""
+
+    def __init__(self, high_water=1024):
+        self.high_water = high_water
+        self.items = CircularQueue(high_water)
+        self.getters = deque()
+        self.putters = deque()
+
+    def __len__(self):
+        return self.items.size
+
+    def is_empty(self):
+        return self.items.is_empty()
+
+    def _wakeup_next(self, waiters):
+        while waiters:
+            waiter = waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                break
+
+    # элемент забирает сам проснувшийся, поэтому отмена ничего не теряет:
+    # если нас разбудили и тут же отменили, будим следующего
+    async def _wait(self, waiters, ready):
+        while not ready():
+            waiter = asyncio.get_running_loop().create_future()
+            waiters.append(waiter)
+            try:
+                await waiter
+            except BaseException:
+                waiter.cancel()
+                if waiter in waiters:
+                    waiters.remove(waiter)
+                if ready():
+                    self._wakeup_next(waiters)
+                raise
+
+    def _has_items(self):
+        return not self.items.is_empty()
+
+    def _has_room(self):
+        return self.items.size < self.high_water
+
+    def put_nowait(self, item):
+        if self.items.size >= self.high_water:
+            raise asyncio.QueueFull
+        self.items.enqueue(item)
+        if self.getters:
+            self._wakeup_next(self.getters)
+
+    # на быстром пути не создаём корутину ожидания
+    async def put(self, item):
+        if self.items.size >= self.high_water:
+            await self._wait(self.putters, self._has_room)
+        self.put_nowait(item)
+
+    def get_nowait(self):
+        if self.items.size == 0:
+            raise asyncio.QueueEmpty
+        item = self.items.dequeue()
+        if self.putters:
+            self._wakeup_next(self.putters)
+        return item
+
+    async def get(self):
+        if self.items.size == 0:
+            await self._wait(self.getters, self._has_items)
+        return self.get_nowait()
+
+    async def get_batch(self, max_items, timeout=None):
+        """Ждёт хотя бы один элемент не дольше timeout и забирает до max_items"""
+        if self.items.size == 0:
+            try:
+                async with asyncio.timeout(timeout):
+                    await self._wait(self.getters, self._has_items)
+            except TimeoutError:
+                # элемент мог прийти вместе с таймаутом - заберём, что есть
+                pass
+        dequeue = self.items.dequeue
+        batch = [dequeue() for _ in range(min(max_items, self.items.size))]
+        for _ in batch:
+            if not self.putters:
+                break
+            self._wakeup_next(self.putters)
+        return batch
+
+
+def benchmark_async_queues(total=200000, high_water=1024, batch=64):
+    print(f"\nПередача {total} элементов между корутинами, мкс на элемент:")
+
+    async def run(q, consume):
+        async def producer():
+            for i in range(total):
+                await q.put(i)
+
+        start = time.perf_counter()
+        await asyncio.gather(producer(), consume(q))
+        return (time.perf_counter() - start) / total * 1e6
+
+    async def one_by_one(q):
+        for _ in range(total):
+            await q.get()
+
+    async def batched(q):
+        got = 0
+        while got < total:
+            got += len(await q.get_batch(batch))
+
+    cases = [
+        ("asyncio.Queue", lambda: asyncio.Queue(high_water), one_by_one),
+        ("AsyncCircularQueue", lambda: AsyncCircularQueue(high_water), one_by_one),
+        (f"AsyncCircularQueue, get_batch({batch})", lambda: AsyncCircularQueue(high_water), batched),
+    ]
+    for name, make_queue, consume in cases:
+        print(f"{name:<36} {asyncio.run(run(make_queue(), consume)):.2f}")
+
+
+def _run_producers_consumer(producer, consumer, producers):
+    threads = [threading.Thread(target=producer) for _ in range(producers)]
+    threads.append(threading.Thread(target=consumer))
+    start = time.perf_counter()
+    for th in threads:
+        th.start()
+    for th in threads:
+        th.join()
+    return time.perf_counter() - start
+
+
+def benchmark_blocking_queues(total=200000, capacity=1024, batch=64):
+    print(f"\nПередача {total} элементов между потоками, элементов/с:")
+    print(f"{'Очередь':<28} {'1 писатель':>12} {'4 писателя':>12} {'16 писателей':>13}")
+
+    def plain(make_queue):
+        def run(producers):
+            q = make_queue()
+            per = total // producers
+
+            def producer():
+                for i in range(per):
+                    q.put(i)
+
+            def consumer():
+                for _ in range(per * producers):
+                    q.get()
+            return per * producers / _run_producers_consumer(producer, consumer, producers)
+        return run
+
+    def batched(make_queue):
+        def run(producers):
+            q = make_queue()
+            per = total // producers
+
+            def producer():
+                for i in range(0, per, batch):
+                    q.put_many(range(i, min(i + batch, per)))
+
+            def consumer():
+                got = 0
+                while got < per * producers:
+                    got += len(q.get_many(batch))
+            return per * producers / _run_producers_consumer(producer, consumer, producers)
+        return run
+
+    cases = [
+        ("queue.Queue", plain(lambda: queue.Queue(capacity)), (1, 4, 16)),
+        ("BlockingCircularQueue", plain(lambda: BlockingCircularQueue(capacity)), (1, 4, 16)),
+        ("BlockingCircularQueue, пачки", batched(lambda: BlockingCircularQueue(capacity)), (1, 4, 16)),
+        ("SPSCCircularQueue", plain(lambda: SPSCCircularQueue(capacity)), (1,)),
+        ("SPSCCircularQueue, пачки", batched(lambda: SPSCCircularQueue(capacity)), (1,)),
+    ]
+    for name, run, counts in cases:
+        cells = []
+        for producers in (1, 4, 16):
+            cells.append(f"{run(producers):,.0f}" if producers in counts else "-")
+        print(f"{name:<28} {cells[0]:>12} {cells[1]:>12} {cells[2]:>13}")
+
+
 def test_queue_implementations():
     """Тестирование обеих реализаций очереди"""    
     #Тест циклической очереди
@@ -140,4 +602,7 @@ def test_queue_implementations():
 
 
 if __name__ == "__main__":
-    test_queue_implementations()
\ No newline at end of file
+    test_queue_implementations()
+    benchmark_blocking_queues()
+    benchmark_byte_ring()
+    benchmark_async_queues()
\ No newline at end of file
@@ -1,46 +1,360 @@
+from array import array
+from collections import OrderedDict
+from itertools import islice, repeat
+import math
+import operator
+import re
+import time
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def divide(a, b):
+    if b == 0:
+        raise ValueError("Деление на ноль")
+    return a / b
+
+
+def power(a, b):
+    # 0 в отрицательной степени - то же деление на ноль, и ошибка та же, что у divide
+    try:
+        return a ** b
+    except ZeroDivisionError:
+        raise ValueError("Деление на ноль") from None
+
+
+def number_token(value):
+    # repr(inf) - это 'inf', его прочитали бы как имя переменной; 1e999 снова даёт inf
+    return '1e999' if math.isinf(value) else repr(value)
+
+
+CONST, VAR, OP, UNARY = 0, 1, 2, 3
+
+# Приоритеты при печати в код Python: атомы (числа, переменные, вызовы) не берём в скобки
+PY_OPERATORS = {'+': ('+', 1), '-': ('-', 1), '*': ('*', 2), '/': ('/', 2), '^': ('**', 4)}
+PY_ATOM = 5
+
+# один проход регуляркой: оператор, имя, число (в том числе 1.5e-3)
+# или любой другой символ - его потом отвергнет scan
+TOKEN_RE = re.compile(r"\s*([-+*/^(),]|[A-Za-z_][A-Za-z0-9_]*|(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?|\S)")
+BAD_CHAR_RE = re.compile(r"[^\sA-Za-z0-9_.+\-*/^(),]")
+OPERATOR_CHARS = frozenset('+-*/^(),')
+
+ARITHMETIC_ERRORS = (ValueError, ZeroDivisionError, OverflowError)
+
+if np is not None:
+    # аналоги операторов и функций калькулятора над целыми столбцами
+    VECTOR_OPERATIONS = {
+        '+': np.add, '-': np.subtract, '*': np.multiply, '/': np.divide, '^': np.power, 'neg': np.negative,
+        'sin': np.sin, 'cos': np.cos, 'tan': np.tan, 'sqrt': np.sqrt, 'log': np.log,
+        'exp': np.exp, 'abs': np.abs, 'min': np.minimum, 'max': np.maximum,
+    }
+
+
+# применить скалярную функцию к столбцам; строки с ошибкой или комплексным
+# результатом (отрицательное в дробной степени) дают nan и отмечаются в invalid
+def column_apply(func, args, n, invalid):
+    if all(isinstance(arg, float) for arg in args):
+        try:
+            value = func(*args)
+        except ARITHMETIC_ERRORS:
+            value = None
+        if value is None or isinstance(value, complex):
+            invalid[:] = array('b', [1]) * n
+            return math.nan
+        return value
+    # списки, а не repeat(): после неудачной первой попытки столбцы проходятся ещё раз
+    columns = [[arg] * n if isinstance(arg, float) else arg for arg in args]
+    try:
+        result = list(map(func, *columns))
+        if not any(isinstance(value, complex) for value in result):
+            return result
+    except ARITHMETIC_ERRORS:
+        pass
+    result = []
+    for i, row in enumerate(zip(*columns)):
+        try:
+            value = func(*row)
+        except ARITHMETIC_ERRORS:
+            value = None
+        if value is None or isinstance(value, complex):
+            result.append(math.nan)
+            invalid[i] = 1
+        else:
+            result.append(value)
+    return result
+
+
+class CompiledExpression:
+    """Выражение, разобранное один раз: константы уже float, операторы - готовые функции"""
+
+    def __init__(self, expression, rpn, code, variables, original_rpn=None, source=None, function=None):
+        self.expression = expression
+        self.rpn = rpn
+        self.code = code
+        self.variables = variables
+        # rpn - то, что реально считается (после оптимизации), original_rpn - как разобрано
+        self.original_rpn = original_rpn if original_rpn is not None else rpn
+        self.source = source
+        self.function = function
+
+    def evaluate(self, **values):
+        if self.function is None:
+            return self.interpret(**values)
+        try:
+            args = [float(values[name]) for name in self.variables]
+        except KeyError as e:
+            raise ValueError(f"Не задана переменная '{e.args[0]}'") from None
+        try:
+            return self.function(*args)
+        except ZeroDivisionError:
+            # в сгенерированном коде / и ** встроены, ошибку приводим к виду divide и power
+            raise ValueError("Деление на ноль") from None
+
+    def interpret(self, **values):
+        """Вычисление стековой машиной по self.code, без сгенерированной функции"""
+        stack = []
+        push, pop = stack.append, stack.pop
+        for kind, arg in self.code:
+            if kind == CONST:
+                push(arg)
+            elif kind == VAR:
+                try:
+                    push(float(values[arg]))
+                except KeyError:
+                    raise ValueError(f"Не задана переменная '{arg}'") from None
+            elif kind == UNARY:
+                push(arg(pop()))
+            else:
+                b = pop()
+                push(arg(pop(), b))
+        return stack[0]
+
+    def dump(self):
+        lines = [
+            f"Выражение:  {self.expression}",
+            f"ОПН:        {' '.join(self.original_rpn)}",
+            f"После опт.: {' '.join(self.rpn)}",
+            f"Переменные: {', '.join(self.variables) or '-'}",
+        ]
+        if self.source is not None:
+            lines.append("Код:")
+            lines.extend("    " + line for line in self.source.rstrip().splitlines())
+        return "\n".join(lines)
+
+    def evaluate_batch(self, columns, size=None, use_numpy=True):
+        """Считает выражение по столбцам: (результаты, отметки строк с ошибкой или не конечным результатом)"""
+        missing = [name for name in self.variables if name not in columns]
+        if missing:
+            raise ValueError(f"Не задана переменная '{missing[0]}'")
+        lengths = {len(columns[name]) for name in self.variables}
+        if not lengths and size is None:
+            # в формуле нет переменных: строк столько же, сколько в переданных столбцах
+            lengths = {len(column) for column in columns.values()}
+        if len(lengths) > 1:
+            raise ValueError("Столбцы разной длины")
+        n = lengths.pop() if lengths else (size if size is not None else 1)
+
+        if use_numpy and np is not None:
+            return self._evaluate_numpy(columns, n)
+        return self._evaluate_columns(columns, n)
+
+    def _evaluate_numpy(self, columns, n):
+        invalid = np.zeros(n, dtype=bool)
+        stack = []
+        push, pop = stack.append, stack.pop
+        with np.errstate(all='ignore'):
+            for (kind, arg), token in zip(self.code, self.rpn):
+                if kind == CONST:
+                    push(arg)
+                elif kind == VAR:
+                    push(np.asarray(columns[arg], dtype=float))
+                else:
+                    arity = 1 if kind == UNARY else 2
+                    args = stack[len(stack) - arity:]
+                    del stack[len(stack) - arity:]
+                    func = VECTOR_OPERATIONS.get(token)
+                    if func is None:
+                        # своя функция без numpy-аналога - поэлементно
+                        func = np.frompyfunc(arg, arity, 1)
+                    out = np.asarray(func(*args), dtype=float)
+                    # numpy не бросает ошибок, а даёт inf/nan (деление на ноль, log(0),
+                    # переполнение); отмечаем сразу, дальше max или 1/x могли бы
+                    # превратить их в конечное число
+                    failed = ~np.isfinite(out)
+                    for a in args:
+                        failed &= np.isfinite(a)
+                    invalid |= failed
+                    push(out)
+            result = np.array(np.broadcast_to(stack[0], n), dtype=float)
+        result[invalid] = np.nan
+        invalid |= ~np.isfinite(result)
+        return result, invalid
+
+    # запасной путь без numpy: столбцы как списки, результат - array('d')
+    def _evaluate_columns(self, columns, n):
+        invalid = array('b', bytes(n))
+        stack = []
+        push, pop = stack.append, stack.pop
+        for kind, arg in self.code:
+            if kind == CONST:
+                push(arg)
+            elif kind == VAR:
+                # как float(...) в evaluate: на целых столбцах 700 ^ 700 было бы точным int без переполнения
+                push(array('d', columns[arg]))
+            elif kind == UNARY:
+                push(column_apply(arg, [pop()], n, invalid))
+            else:
+                b = pop()
+                push(column_apply(arg, [pop(), b], n, invalid))
+        top = stack[0]
+        result = array('d', repeat(top, n)) if isinstance(top, float) else array('d', top)
+        for i, value in enumerate(result):
+            if invalid[i]:
+                result[i] = math.nan
+            elif not math.isfinite(value):
+                invalid[i] = 1
+        return result, invalid
+
+
 class Calculator:
     
-    def __init__(self):
-        self.precedence = {'+': 1, '-': 1, '*': 2, '/': 2, '^': 3}
-        self.associativity = {'+': 'L', '-': 'L', '*': 'L', '/': 'L', '^': 'R'}
+    def __init__(self, cache_size=1024, optimize=True):
+        # neg - унарный минус: сильнее * и /, но слабее ^, так что -2^2 = -4
+        self.precedence = {'+': 1, '-': 1, '*': 2, '/': 2, 'neg': 3, '^': 4}
+        self.associativity = {'+': 'L', '-': 'L', '*': 'L', '/': 'L', 'neg': 'R', '^': 'R'}
+        self.operations = {'+': operator.add, '-': operator.sub, '*': operator.mul,
+                           '/': divide, '^': power}
+        # имя -> (функция, число аргументов)
+        self.functions = {
+            'sin': (math.sin, 1), 'cos': (math.cos, 1), 'tan': (math.tan, 1),
+            'sqrt': (math.sqrt, 1), 'log': (math.log, 1), 'exp': (math.exp, 1),
+            'abs': (abs, 1), 'min': (min, 2), 'max': (max, 2),
+        }
+        # LRU-кэш скомпилированных выражений по тексту
+        self.cache_size = cache_size
+        self.cache = OrderedDict()
+        self.cache_hits = 0
+        self.cache_misses = 0
+        # сворачивать константы и генерировать функцию Python при компиляции
+        self.optimize = optimize
     
     def is_operator(self, token):
         return token in self.precedence
     
+    def is_number(self, token):
+        return token[0].isdigit() or token[0] == '.'
+
     def infix_to_rpn(self, expression):
         output = []
-        stack = []
+        stack = []      # (токен, номер токена)
+        calls = []      # на каждую открытую скобку: [функция, аргументов] или None
+        expect_operand = True
+        
+        tokens = self.scan(expression)
         
-        tokens = self.tokenize(expression)
+        def error(message, index):
+            return ValueError(f"{message} (позиция {self.token_position(expression, index)})")
         
-        for token in tokens:
-            if token.replace('.', '').isdigit():
-                output.append(token)
+        for i, token in enumerate(tokens):
+            is_op = token in OPERATOR_CHARS
+            if not expect_operand and (not is_op or token == '('):
+                raise error(f"Пропущен оператор перед '{token}'", i)
+
+            if not is_op:
+                if self.is_number(token):
+                    output.append(token)
+                    expect_operand = False
+                elif token in self.functions:
+                    if i + 1 == len(tokens) or tokens[i + 1] != '(':
+                        raise error(f"После функции '{token}' нужна '('", i)
+                    stack.append((token, i))
+                elif token in self.precedence:
+                    # neg - внутренний токен унарного минуса в ОПН, переменной его не назвать
+                    raise error(f"Имя '{token}' зарезервировано", i)
+                else:
+                    output.append(token)
+                    expect_operand = False
             elif token == '(':
-                stack.append(token)
+                is_call = i > 0 and tokens[i - 1] in self.functions
+                calls.append([tokens[i - 1], 1] if is_call else None)
+                stack.append((token, i))
+            elif token == ',':
+                if not calls or calls[-1] is None or expect_operand:
+                    raise error("Неуместная запятая", i)
+                while stack[-1][0] != '(':
+                    output.append(stack.pop()[0])
+                calls[-1][1] += 1
+                expect_operand = True
             elif token == ')':
-                while stack and stack[-1] != '(':
-                    output.append(stack.pop())
+                if expect_operand:
+                    raise error("Не хватает операнда перед ')'", i)
+                while stack and stack[-1][0] != '(':
+                    output.append(stack.pop()[0])
+                if not stack:
+                    raise error("Лишняя закрывающая скобка", i)
                 stack.pop()
-            elif self.is_operator(token):
-                while (stack and stack[-1] != '(' and
-                       (self.precedence[stack[-1]] > self.precedence[token] or
-                        (self.precedence[stack[-1]] == self.precedence[token] and 
+                call = calls.pop()
+                if call is not None:
+                    name, count = call
+                    arity = self.functions[name][1]
+                    if count != arity:
+                        raise error(f"Функция '{name}' ждёт аргументов: {arity}, передано {count}", i)
+                    output.append(stack.pop()[0])
+            elif expect_operand:
+                # в начале, после оператора или скобки +/- унарные
+                if token == '-':
+                    stack.append(('neg', i))
+                elif token != '+':
+                    raise error(f"Оператору '{token}' не хватает операнда", i)
+            else:
+                while (stack and stack[-1][0] in self.precedence and
+                       (self.precedence[stack[-1][0]] > self.precedence[token] or
+                        (self.precedence[stack[-1][0]] == self.precedence[token] and 
                          self.associativity[token] == 'L'))):
-                    output.append(stack.pop())
-                stack.append(token)
+                    output.append(stack.pop()[0])
+                stack.append((token, i))
+                expect_operand = True
         
+        if expect_operand:
+            raise error("Выражение обрывается", len(tokens))
         while stack:
-            output.append(stack.pop())
+            token, i = stack.pop()
+            if token == '(':
+                raise error("Незакрытая скобка", i)
+            output.append(token)
         
         return output
     
+    def scan(self, expression):
+        bad = BAD_CHAR_RE.search(expression)
+        if bad:
+            raise ValueError(f"Неожиданный символ '{bad.group()}' (позиция {bad.start()})")
+        tokens = TOKEN_RE.findall(expression)
+        # точка без цифр - единственный допустимый символ, который не даёт токена
+        if '.' in tokens:
+            position = self.token_position(expression, tokens.index('.'))
+            raise ValueError(f"Неожиданный символ '.' (позиция {position})")
+        return tokens
+
+    # позиции нужны только в сообщениях об ошибках, поэтому считаются отдельно
+    def token_position(self, expression, index):
+        match = next(islice(TOKEN_RE.finditer(expression), index, None), None)
+        return match.start(1) if match else len(expression)
+
     def tokenize(self, expression):
+        return self.scan(expression)
+
+    # прежний посимвольный токенизатор, оставлен для сравнения скорости
+    def tokenize_by_char(self, expression):
         tokens = []
         current_number = ''
         
         for char in expression.replace(' ', ''):
-            if char.isdigit() or char == '.':
+            if char.isalnum() or char in '._':
                 current_number += char
             else:
                 if current_number:
@@ -53,30 +367,27 @@ class Calculator:
         
         return tokens
     
-    def calculate_rpn(self, rpn):
+    def calculate_rpn(self, rpn, variables=None):
         stack = []
         
         for token in rpn:
-            if token.replace('.', '').isdigit():
+            if self.is_number(token):
                 stack.append(float(token))
-            else:
+            elif token in self.functions:
+                func, arity = self.functions[token]
+                args = stack[len(stack) - arity:]
+                del stack[len(stack) - arity:]
+                stack.append(func(*args))
+            elif token == 'neg':
+                stack.append(-stack.pop())
+            elif token in self.operations:
                 b = stack.pop()
                 a = stack.pop()
-                
-                if token == '+':
-                    result = a + b
-                elif token == '-':
-                    result = a - b
-                elif token == '*':
-                    result = a * b
-                elif token == '/':
-                    if b == 0:
-                        raise ValueError("Деление на ноль")
-                    result = a / b
-                elif token == '^':
-                    result = a ** b
-                
-                stack.append(result)
+                stack.append(self.operations[token](a, b))
+            elif variables is not None and token in variables:
+                stack.append(float(variables[token]))
+            else:
+                raise ValueError(f"Не задана переменная '{token}'")
         
         return stack[0]
     
@@ -85,6 +396,176 @@ class Calculator:
         result = self.calculate_rpn(rpn)
         return rpn, result
 
+    def compile(self, expression):
+        compiled = self.cache.get(expression)
+        if compiled is not None:
+            self.cache_hits += 1
+            self.cache.move_to_end(expression)
+            return compiled
+
+        self.cache_misses += 1
+        compiled = self._compile(expression)
+        self.cache[expression] = compiled
+        if len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+        return compiled
+
+    def _compile(self, expression):
+        original = self.infix_to_rpn(expression)
+        rpn = self.optimize_rpn(original) if self.optimize else original
+        code = []
+        variables = []
+        depth = 0
+        for token in rpn:
+            if self.is_number(token):
+                code.append((CONST, float(token)))
+                depth += 1
+            elif token in self.functions:
+                func, arity = self.functions[token]
+                code.append((UNARY if arity == 1 else OP, func))
+                depth -= arity - 1
+            elif token == 'neg':
+                code.append((UNARY, operator.neg))
+            elif token in self.operations:
+                code.append((OP, self.operations[token]))
+                depth -= 1
+            else:
+                code.append((VAR, token))
+                if token not in variables:
+                    variables.append(token)
+                depth += 1
+        # infix_to_rpn уже проверил порядок операндов и операторов
+        assert depth == 1
+        source = function = None
+        if self.optimize:
+            source, function = self.generate_function(rpn, variables, expression)
+        return CompiledExpression(expression, rpn, code, variables, original, source, function)
+
+    def _fold(self, kind, args):
+        # операнды уже свёрнуты: узлы ('num', значение), ('var', имя) или (оператор/функция, *операнды)
+        if all(arg[0] == 'num' for arg in args):
+            values = [arg[1] for arg in args]
+            if kind == 'neg':
+                func = operator.neg
+            elif kind in self.operations:
+                func = self.operations[kind]
+            else:
+                func = self.functions[kind][0]
+            try:
+                value = func(*values)
+            except (ValueError, ZeroDivisionError, OverflowError):
+                # ошибку оставляем на время вычисления, как и без оптимизации
+                value = None
+            if isinstance(value, float) and math.isfinite(value):
+                return ('num', value)
+
+        if kind == 'neg':
+            if args[0][0] == 'neg':
+                return args[0][1]
+            return ('neg', args[0])
+        if len(args) == 2:
+            a, b = args
+            if b[0] == 'num':
+                if b[1] == 0 and kind in ('+', '-'):
+                    return a
+                if b[1] == 1 and kind in ('*', '/', '^'):
+                    return a
+                # x^0 не сворачиваем в 1: пропала бы переменная x (и проверка, что она задана)
+                # или подвыражение с ошибкой; число в нулевой степени уже свёрнуто выше
+            if a[0] == 'num':
+                if (a[1] == 0 and kind == '+') or (a[1] == 1 and kind == '*'):
+                    return b
+        return (kind, *args)
+
+    def optimize_rpn(self, rpn):
+        """Сворачивает константные подвыражения и убирает тождества вида x*1, x+0, --x"""
+        stack = []
+        for token in rpn:
+            if self.is_number(token):
+                stack.append(('num', float(token)))
+            elif token == 'neg':
+                stack.append(self._fold('neg', [stack.pop()]))
+            elif token in self.operations or token in self.functions:
+                arity = 2 if token in self.operations else self.functions[token][1]
+                args = stack[len(stack) - arity:]
+                del stack[len(stack) - arity:]
+                stack.append(self._fold(token, args))
+            else:
+                stack.append(('var', token))
+
+        # обратно в ОПН без рекурсии: длинные цепочки x+x+...+x дают глубокие деревья
+        out = []
+        pending = [stack[0]]
+        while pending:
+            node = pending.pop()
+            if isinstance(node, str):
+                out.append(node)
+            elif node[0] == 'num':
+                # отрицательные константы записываем через neg: токен "-2.0" читался бы как оператор
+                if math.copysign(1.0, node[1]) < 0:
+                    out.append(number_token(-node[1]))
+                    out.append('neg')
+                else:
+                    out.append(number_token(node[1]))
+            elif node[0] == 'var':
+                out.append(node[1])
+            else:
+                pending.append(node[0])
+                pending.extend(reversed(node[1:]))
+        return out
+
+    def generate_function(self, rpn, variables, expression=''):
+        """Переводит ОПН в исходник функции Python и компилирует его: (исходник, функция)"""
+        args = {name: f"v{i}" for i, name in enumerate(variables)}
+        namespace = {}
+        stack = []  # (текст, приоритет)
+        for token in rpn:
+            if self.is_number(token):
+                stack.append((number_token(float(token)), PY_ATOM))
+            elif token == 'neg':
+                text, prec = stack.pop()
+                if prec < self.precedence['neg']:
+                    text = f"({text})"
+                stack.append((f"-{text}", self.precedence['neg']))
+            elif token in self.functions:
+                func, arity = self.functions[token]
+                namespace[f"_{token}"] = func
+                operands = [text for text, _ in stack[len(stack) - arity:]]
+                del stack[len(stack) - arity:]
+                stack.append((f"_{token}({', '.join(operands)})", PY_ATOM))
+            elif token in self.operations:
+                (b, pb), (a, pa) = stack.pop(), stack.pop()
+                symbol, prec = PY_OPERATORS[token]
+                right = self.associativity[token] == 'R'
+                if pa < prec or (pa == prec and right):
+                    a = f"({a})"
+                if pb < prec or (pb == prec and not right):
+                    b = f"({b})"
+                stack.append((f"{a} {symbol} {b}", prec))
+            else:
+                stack.append((args[token], PY_ATOM))
+
+        source = f"def _compiled({', '.join(args.values())}):\n    return {stack[0][0]}\n"
+        try:
+            code = compile(source, f"<calc: {expression}>", "exec")
+        except (SyntaxError, RecursionError, MemoryError):
+            # слишком глубокая вложенность для компилятора Python - остаётся интерпретатор
+            return source, None
+        exec(code, namespace)
+        return source, namespace['_compiled']
+
+    def evaluate_cached(self, expression, **values):
+        return self.compile(expression).evaluate(**values)
+
+    def cache_info(self):
+        total = self.cache_hits + self.cache_misses
+        return {
+            'hits': self.cache_hits,
+            'misses': self.cache_misses,
+            'size': len(self.cache),
+            'hit_rate': self.cache_hits / total if total else 0.0,
+        }
+
 
 def test_calculator():
     """Тестирование калькулятора"""
@@ -137,7 +618,8 @@ def test_calculator():
         "10 / 0",
         "3 + * 4",
         "(3 + 4",
-        "3 + 4)"
+        "3 + 4)",
+        "neg + 1"
     ]
     
     for expr in error_expressions:
@@ -151,11 +633,125 @@ def test_calculator():
             print(f"\nВыражение: {expr}")
             print(f"Ожидаемая ошибка: {type(e).__name__}: {e}")
             print("Ошибка обработана корректно")
+
+    batch_cases = [
+        ("1 / x", [1, 0, 2, 4], [1.0, None, 0.5, 0.25]),
+        ("x ^ 0.5 + 1", [4, -1, 9], [3.0, None, 4.0]),
+        # ошибка в промежуточном шаге, хотя итог конечен
+        ("1 / (x ^ -1)", [0, 1], [None, 1.0]),
+        ("max(log(x), 1)", [0, 1], [None, 1.0]),
+        ("1", [1, 2, 3], [1.0, 1.0, 1.0]),
+    ]
+    backends = [False] if np is None else [False, True]
+
+    for use_numpy in backends:
+        print(f"\n\nПакетное вычисление {'с numpy' if use_numpy else 'без numpy'}:")
+        for expr, xs, expected in batch_cases:
+            result, invalid = calc.compile(expr).evaluate_batch({'x': xs}, use_numpy=use_numpy)
+            got = [None if flag else float(value) for value, flag in zip(result, invalid)]
+            print(f"\n{expr} при x = {xs}: {got}")
+            if got == expected and len(result) == len(xs):
+                print("ТЕСТ ПРОЙДЕН")
+            else:
+                print(f"Ожидалось: {expected}")
+                print("ТЕСТ НЕ ПРОЙДЕН")
+                all_passed = False
     
     if all_passed:
         print("ВСЕ ТЕСТЫ ПРОЙДЕНЫ УСПЕШНО!")
     else:
         print("НЕКОТОРЫЕ ТЕСТЫ НЕ ПРОЙДЕНЫ!")
 
+
+def benchmark_compiled(rounds=20000):
+    print(f"\nПовторное вычисление формул, {rounds} раз:")
+    calc = Calculator()
+    formulas = ["3 + 4 * 2", "(x + 4) * y", "12.5 + x * (y - 2) / 3", "x ^ 2 + y ^ 2"]
+
+    start = time.perf_counter()
+    for i in range(rounds):
+        for formula in formulas:
+            text = formula.replace('x', str(i % 10 + 1)).replace('y', '2')
+            calc.evaluate(text)
+    plain_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for i in range(rounds):
+        for formula in formulas:
+            calc.evaluate_cached(formula, x=i % 10 + 1, y=2)
+    compiled_time = time.perf_counter() - start
+
+    n = rounds * len(formulas)
+    print(f"evaluate:        {n / plain_time:>12,.0f} выражений/с")
+    print(f"evaluate_cached: {n / compiled_time:>12,.0f} выражений/с")
+    print(f"Кэш: {calc.cache_info()}")
+
+
+def benchmark_optimizer(rounds=50000):
+    print(f"\nИнтерпретация ОПН против сгенерированной функции, {rounds} раз:")
+    calc = Calculator()
+    formulas = ["3 + 4 * 2", "(x + 4) * y", "12.5 + x * (y - 2) / 3", "x ^ 2 + y ^ 2",
+                "(x * 1 + 0) * (2 ^ 10 / 4) + sqrt(16) * y - (3 - 3) * x"]
+    print(calc.compile(formulas[-1]).dump())
+    for formula in formulas:
+        compiled = calc.compile(formula)
+        timings = []
+        for evaluate in (compiled.interpret, compiled.evaluate):
+            start = time.perf_counter()
+            for i in range(rounds):
+                evaluate(x=i % 10 + 1, y=2)
+            timings.append(rounds / (time.perf_counter() - start))
+        print(f"{formula:<58} {timings[0]:>10,.0f} {timings[1]:>10,.0f}  x{timings[1] / timings[0]:.1f}")
+
+
+def benchmark_tokenizers(repeat=2000, rounds=20):
+    calc = Calculator()
+    cases = [
+        ("короткие токены", "(x1 + 2.5) * 3 - 4 / (5 + 6) ^ 2"),
+        ("длинные токены", "(temperature_outside + 1234567.891011) * coefficient_of_expansion"),
+    ]
+    for title, part in cases:
+        expression = " + ".join([part] * repeat)
+        count = len(calc.tokenize(expression))
+        print(f"\nТокенизация, {title}: {count} токенов")
+
+        for name, tokenize in (("посимвольный", calc.tokenize_by_char), ("регулярка", calc.tokenize)):
+            start = time.perf_counter()
+            for _ in range(rounds):
+                tokenize(expression)
+            total = time.perf_counter() - start
+            print(f"{name:<14} {count * rounds / total:>12,.0f} токенов/с")
+
+
+def benchmark_batch(rows=200000):
+    print(f"\nОдна формула на {rows} строках, строк/с:")
+    calc = Calculator()
+    compiled = calc.compile("(x + 4) * y / (x - 2) + sqrt(abs(y))")
+    xs = array('d', (i % 7 for i in range(rows)))
+    ys = array('d', (i % 13 - 6 for i in range(rows)))
+
+    start = time.perf_counter()
+    for x, y in zip(xs, ys):
+        try:
+            compiled.evaluate(x=x, y=y)
+        except ValueError:
+            pass
+    loop_time = time.perf_counter() - start
+    print(f"{'evaluate в цикле':<24} {rows / loop_time:>14,.0f}")
+
+    backends = [(False, "evaluate_batch, array")]
+    if np is not None:
+        backends.append((True, "evaluate_batch, numpy"))
+    for use_numpy, name in backends:
+        start = time.perf_counter()
+        result, invalid = compiled.evaluate_batch({'x': xs, 'y': ys}, use_numpy=use_numpy)
+        total = time.perf_counter() - start
+        print(f"{name:<24} {rows / total:>14,.0f}  (строк с ошибкой: {sum(invalid)})")
+
+
 if __name__ == "__main__":
-    test_calculator()
\ No newline at end of file
+    test_calculator()
+    benchmark_compiled()
+    benchmark_optimizer()
+    benchmark_tokenizers()
+    benchmark_batch()
\ No newline at end of file
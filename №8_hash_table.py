@@ -1,74 +1,223 @@
+from array import array
+from collections.abc import ItemsView, Mapping, MutableMapping, ValuesView
+import gc
+from hashlib import blake2b
+import mmap
+import operator
+import os
+import random
+import struct
+import sys
+import tempfile
+import threading
+import time
+import zlib
+
+EMPTY = -1
+HASH_MASK = (1 << 63) - 1
+_MISSING = object()
+_MISSING_VALUE = object()
+
+# Файл MappedHashTable: два слота заголовка, затем данные.
+# Каталог корзин - страницы массива (хэш, смещение записи) и таблица их смещений; записи - (длина ключа, длина значения, ключ, значение)
+FILE_MAGIC = b"HTBLMAP2"
+HEADER = struct.Struct('<8sQQQQQQ')  # magic, поколение, таблица страниц каталога, его ёмкость, записей, занято слотов, конец кучи
+HEADER_SLOT = 64
+DATA_START = 2 * HEADER_SLOT
+ENTRY = struct.Struct('<QQ')
+RECORD = struct.Struct('<II')
+SLOT_EMPTY = 0
+SLOT_DELETED = 1
+DIR_PAGE = 256  # слотов в странице каталога, единица копирования при записи
+CUCKOO_STASH = 4
+CUCKOO_REBUILDS = 8
+
+
+def djb2(key):
+    """Полный (не по модулю ёмкости) хэш ключа: djb2 для строк, встроенный hash для остального"""
+    if isinstance(key, str):
+        hash_val = 5381
+        for char in key:
+            hash_val = ((hash_val << 5) + hash_val) + ord(char)
+        return hash_val & HASH_MASK
+    if isinstance(key, bytes):
+        # hash(bytes) зависит от PYTHONHASHSEED, а хэш в файле должен быть одинаковым у всех процессов
+        hash_val = 5381
+        for byte in key:
+            hash_val = ((hash_val << 5) + hash_val) + byte
+        return hash_val & HASH_MASK
+    return hash(key) & HASH_MASK
+
+
+def seeded_hashers(seed):
+    """Ключевые blake2b для seeded_hash: по одному на тип ключа, чтобы 'a' и b'a' не совпадали"""
+    return tuple(blake2b(digest_size=8, key=seed, person=kind) for kind in (b's', b'b', b'i', b'h'))
+
+
+def seeded_hash(key, hashers):
+    """64-битный хэш ключа с секретным seed: blake2b от байтов самого ключа.
+
+    Строки, bytes и целые (и числа, равные целому: 2.0 == 2) хэшируются по
+    содержимому, а не через hash(key): у int hash(i * (2**61 - 1)) одинаков,
+    и никакой seed поверх hash() такие ключи не разведёт. Для остальных типов
+    другого равенства-совместимого представления нет, берётся hash(key).
+    """
+    if isinstance(key, str):
+        hasher, data = hashers[0].copy(), key.encode('utf-8', 'surrogatepass')
+    elif isinstance(key, bytes):
+        hasher, data = hashers[1].copy(), key
+    else:
+        try:
+            number = operator.index(key)
+        except TypeError:
+            try:
+                number = int(key)
+                if number != key:
+                    number = None
+            except (TypeError, ValueError, OverflowError):
+                number = None
+        if number is None:
+            hasher, data = hashers[3].copy(), hash(key).to_bytes(8, 'little', signed=True)
+        else:
+            hasher, data = hashers[2].copy(), number.to_bytes(number.bit_length() // 8 + 1, 'little', signed=True)
+    hasher.update(data)
+    return int.from_bytes(hasher.digest(), 'little')
+
+
+def spread(hash_val):
+    """Перемешивает биты хэша: у djb2 похожие ключи дают соседние значения,
+    а линейное пробирование по младшим битам собирает из них длинные кластеры"""
+    hash_val ^= hash_val >> 31
+    hash_val = (hash_val * 0x9E3779B97F4A7C15) & HASH_MASK
+    return hash_val ^ (hash_val >> 29)
+
+
 class HashNode:
+    __slots__ = ('key', 'value', 'hash', 'next')
     
-    def __init__(self, key, value):
+    def __init__(self, key, value, hash_val=None):
         self.key = key
         self.value = value
+        # полный хэш ключа: при переносе в новый массив корзин не пересчитывается
+        self.hash = djb2(key) if hash_val is None else hash_val
         self.next = None
 
 
-class CustomHashTable:
+class CustomHashTable(MutableMapping):
+    """Хэш-таблица с цепочками и постепенным (как в Redis) рехэшированием.
+
+    При росте старый массив корзин остаётся рядом с новым, и каждая put/remove
+    переносит не больше rehash_step непустых корзин. rehash_step=None
+    переносит всё за один раз. sample_every=N считает попадания и промахи
+    у каждого N-го поиска (0 - не считать).
+    """
     
-    def __init__(self, capacity=16, load_factor=0.75):
+    def __init__(self, capacity=16, load_factor=0.75, rehash_step=1, sample_every=0):
         self.capacity = capacity
         self.load_factor = load_factor
         self.size = 0
         self.buckets = [None] * capacity
+        self.rehash_step = rehash_step
+        # старый массив корзин, пока идёт перенос; корзины до rehash_index уже перенесены
+        self.old_buckets = None
+        self.old_capacity = 0
+        self.rehash_index = 0
+        # счётчики для stats()
+        self.rehash_count = 0
+        self.rehash_time = 0.0
+        self.sample_every = sample_every
+        self.sample_countdown = sample_every
+        self.sampled_hits = 0
+        self.sampled_misses = 0
+        # растёт при каждом изменении цепочек: вставке, удалении, переносе корзин
+        self.version = 0
     
     def hash_function(self, key):
-        if isinstance(key, str):
-            hash_val = 5381
-            for char in key:
-                hash_val = ((hash_val << 5) + hash_val) + ord(char)
-            return hash_val % self.capacity
-        else:
-            return hash(key) % self.capacity
-    
-    def put(self, key, value):
-        if self.size / self.capacity >= self.load_factor:
-            self._rehash()
-        
-        index = self.hash_function(key)
-        node = self.buckets[index]
+        return djb2(key) % self.capacity
+
+    def _locate(self, hash_val):
+        # ключ лежит в старом массиве, пока его корзину не перенесли
+        if self.old_buckets is not None:
+            index = hash_val % self.old_capacity
+            if index >= self.rehash_index:
+                return self.old_buckets, index
+        return self.buckets, hash_val % self.capacity
+
+    def _find_node(self, key, hash_val):
+        buckets, index = self._locate(hash_val)
+        node = buckets[index]
+        while node:
+            if node.hash == hash_val and node.key == key:
+                break
+            node = node.next
+        if self.sample_every:
+            self.sample_countdown -= 1
+            if self.sample_countdown <= 0:
+                self.sample_countdown = self.sample_every
+                if node is None:
+                    self.sampled_misses += 1
+                else:
+                    self.sampled_hits += 1
+        return node
+
+    def _insert(self, key, hash_val, value):
+        buckets, index = self._locate(hash_val)
+        node = buckets[index]
         
         if node is None:
-            self.buckets[index] = HashNode(key, value)
+            buckets[index] = HashNode(key, value, hash_val)
             self.size += 1
-            return
+            self.version += 1
+            return True
         
         prev = None
         while node:
-            if node.key == key:
+            if node.hash == hash_val and node.key == key:
                 node.value = value
-                return
+                return False
             prev = node
             node = node.next
         
-        prev.next = HashNode(key, value)
+        prev.next = HashNode(key, value, hash_val)
         self.size += 1
+        self.version += 1
+        return True
     
-    def get(self, key):
-        index = self.hash_function(key)
-        node = self.buckets[index]
-        
-        while node:
-            if node.key == key:
-                return node.value
-            node = node.next
-        
-        raise KeyError(f"Ключ '{key}' не найден")
+    def put(self, key, value):
+        if self.old_buckets is not None:
+            self._rehash_step()
+        # рост - только после добавления нового ключа: замена значения таблицу не перестраивает
+        added = self._insert(key, djb2(key), value)
+        if added and self.old_buckets is None and self.size > self.capacity * self.load_factor:
+            self._rehash()
+    
+    def get(self, key, default=None):
+        node = self._find_node(key, djb2(key))
+        return default if node is None else node.value
+
+    def get_or_raise(self, key):
+        """Прежний get: KeyError на промахе"""
+        node = self._find_node(key, djb2(key))
+        if node is None:
+            raise KeyError(f"Ключ '{key}' не найден")
+        return node.value
     
     def remove(self, key):
-        index = self.hash_function(key)
-        node = self.buckets[index]
+        if self.old_buckets is not None:
+            self._rehash_step()
+        hash_val = djb2(key)
+        buckets, index = self._locate(hash_val)
+        node = buckets[index]
         prev = None
         
         while node:
-            if node.key == key:
+            if node.hash == hash_val and node.key == key:
                 if prev:
                     prev.next = node.next
                 else:
-                    self.buckets[index] = node.next
+                    buckets[index] = node.next
                 self.size -= 1
+                self.version += 1
                 return node.value
             prev = node
             node = node.next
@@ -76,43 +225,960 @@ class CustomHashTable:
         raise KeyError(f"Ключ '{key}' не найден")
     
     def contains(self, key):
-        try:
-            self.get(key)
-            return True
-        except KeyError:
-            return False
-    
-    def _rehash(self):
-        old_buckets = self.buckets
-        self.capacity *= 2
-        self.buckets = [None] * self.capacity
-        self.size = 0
-        
-        for bucket in old_buckets:
-            node = bucket
+        return self._find_node(key, djb2(key)) is not None
+
+    def reserve(self, count):
+        """Готовит место под count записей одним рехэшированием"""
+        if self.old_buckets is not None:
+            self._finish_rehash()
+        capacity = self.capacity
+        while count > capacity * self.load_factor:
+            capacity *= 2
+        if capacity != self.capacity:
+            self._rehash(capacity)
+            self._finish_rehash()
+
+    def put_many(self, items):
+        """Пары (ключ, значение) или Mapping; проверка роста - один раз на всю пачку"""
+        if isinstance(items, Mapping):
+            items = items.items()
+        elif not hasattr(items, '__len__'):
+            items = list(items)
+        self.reserve(self.size + len(items))
+        insert = self._insert
+        for key, value in items:
+            insert(key, djb2(key), value)
+
+    def get_many(self, keys, default=None):
+        find = self._find_node
+        result = []
+        for key in keys:
+            node = find(key, djb2(key))
+            result.append(default if node is None else node.value)
+        return result
+
+    def _iter_nodes(self):
+        # незаконченный перенос доводится сразу, иначе put существующего ключа
+        # во время обхода переставлял бы узлы, по которым идёт обход
+        if self.old_buckets is not None:
+            self._finish_rehash()
+        version = self.version
+        for node in self.buckets:
             while node:
-                self.put(node.key, node.value)
+                yield node
                 node = node.next
+            if self.version != version:
+                raise RuntimeError("Хэш-таблица изменилась во время обхода")
+
+    # интерфейс MutableMapping поверх put/get/remove
+    def __getitem__(self, key):
+        return self.get_or_raise(key)
+
+    def __setitem__(self, key, value):
+        self.put(key, value)
+
+    def __delitem__(self, key):
+        self.remove(key)
+
+    def __contains__(self, key):
+        return self.contains(key)
+
+    def __iter__(self):
+        for node in self._iter_nodes():
+            yield node.key
+
+    def __len__(self):
+        return self.size
+
+    def items(self):
+        return HashTableItems(self)
+
+    def values(self):
+        return HashTableValues(self)
+
+    def update(self, other=(), /, **kwargs):
+        if isinstance(other, Mapping) or not hasattr(other, 'keys'):
+            self.put_many(other)
+        else:
+            self.put_many((key, other[key]) for key in other.keys())
+        if kwargs:
+            self.put_many(kwargs)
+
+    def clear(self):
+        version = self.version
+        self.__init__(16, self.load_factor, self.rehash_step, self.sample_every)
+        self.version = version + 1
+
+    def __repr__(self):
+        body = ", ".join(f"{node.key!r}: {node.value!r}" for node in self._iter_nodes())
+        return f"{type(self).__name__}({{{body}}})"
+    
+    def _rehash(self, capacity=None):
+        start = time.perf_counter()
+        self.old_buckets = self.buckets
+        self.old_capacity = self.capacity
+        self.rehash_index = 0
+        self.capacity = capacity or self.capacity * 2
+        self.buckets = [None] * self.capacity
+        self.rehash_count += 1
+        self.version += 1
+        self.rehash_time += time.perf_counter() - start
+        if self.rehash_step is None:
+            self._finish_rehash()
+
+    def _rehash_step(self):
+        start = time.perf_counter()
+        old, new, capacity = self.old_buckets, self.buckets, self.capacity
+        end = self.old_capacity
+        index = self.rehash_index
+        moved = 0
+        # пустые корзины тоже ограничиваем, чтобы шаг не пробегал весь разреженный массив
+        empty_left = self.rehash_step * 10
+        while index < end and moved < self.rehash_step and empty_left:
+            if old[index] is None:
+                empty_left -= 1
+                index += 1
+                continue
+            moved += 1
+            self._move_bucket(old, index, new, capacity)
+            index += 1
+
+        self.rehash_index = index
+        self.version += 1
+        if index >= end:
+            self._end_rehash()
+        self.rehash_time += time.perf_counter() - start
+
+    def _finish_rehash(self):
+        start = time.perf_counter()
+        old, new, capacity = self.old_buckets, self.buckets, self.capacity
+        for index in range(self.rehash_index, self.old_capacity):
+            if old[index] is not None:
+                self._move_bucket(old, index, new, capacity)
+        self.version += 1
+        self._end_rehash()
+        self.rehash_time += time.perf_counter() - start
+
+    def _end_rehash(self):
+        self.old_buckets = None
+        self.old_capacity = 0
+        self.rehash_index = 0
+
+    @staticmethod
+    def _move_bucket(old, index, new, capacity):
+        node = old[index]
+        old[index] = None
+        while node:
+            nxt = node.next
+            target = node.hash % capacity
+            node.next = new[target]
+            new[target] = node
+            node = nxt
+    
+    def stats(self, max_buckets=4096):
+        """Сводка о состоянии таблицы для метрик, без вывода на экран.
+
+        Если корзин больше max_buckets, цепочки считаются по равномерной выборке
+        корзин (scanned_buckets < buckets): гистограмма тогда по выборке, а
+        max_chain - оценка снизу. max_buckets=None - обойти все корзины.
+        """
+        tables = [(self.buckets, 0)]
+        if self.old_buckets is not None:
+            tables.append((self.old_buckets, self.rehash_index))
+        total = sum(len(buckets) - start for buckets, start in tables)
+        stride = 1 if max_buckets is None or total <= max_buckets else -(-total // max_buckets)
+        offset = random.randrange(stride) if stride > 1 else 0
+
+        histogram = {}
+        scanned = entries = probes = 0
+        for buckets, start in tables:
+            for index in range(start + offset, len(buckets), stride):
+                length = 0
+                node = buckets[index]
+                while node:
+                    length += 1
+                    node = node.next
+                histogram[length] = histogram.get(length, 0) + 1
+                scanned += 1
+                entries += length
+                # ключ на позиции i в цепочке находится за i сравнений
+                probes += length * (length + 1) // 2
+
+        result = {
+            'size': self.size,
+            'buckets': total,
+            'scanned_buckets': scanned,
+            'load_factor': self.size / self.capacity,
+            'chain_histogram': dict(sorted(histogram.items())),
+            'max_chain': max(histogram) if histogram else 0,
+            'mean_probe_hit': probes / entries if entries else 0.0,
+            'mean_probe_miss': entries / scanned if scanned else 0.0,
+            'rehashing': self.old_buckets is not None,
+            'rehash_count': self.rehash_count,
+            'rehash_time': self.rehash_time,
+        }
+        if self.sample_every:
+            result['sampled_hits'] = self.sampled_hits
+            result['sampled_misses'] = self.sampled_misses
+        return result
     
     def visualize(self):
         print(f"\nХэш-таблица (размер: {self.size}, емкость: {self.capacity})")
         
-        for i, bucket in enumerate(self.buckets):
-            chain = []
-            node = bucket
-            while node:
-                chain.append(f"{node.key}:{node.value}")
-                node = node.next
-            
-            if chain:
-                print(f"[{i:3}] → {' → '.join(chain)}")
-            else:
-                print(f"[{i:3}] → пусто")
+        tables = [("", self.buckets)]
+        if self.old_buckets is not None:
+            print(f"Идёт рехэширование: перенесено {self.rehash_index} из {self.old_capacity} корзин")
+            tables = [("старый ", self.old_buckets[self.rehash_index:]), ("новый ", self.buckets)]
+        for title, buckets in tables:
+            if title:
+                print(f"{title}массив:")
+            for i, bucket in enumerate(buckets, self.rehash_index if title == "старый " else 0):
+                chain = []
+                node = bucket
+                while node:
+                    chain.append(f"{node.key}:{node.value}")
+                    node = node.next
+
+                if chain:
+                    print(f"[{i:3}] → {' → '.join(chain)}")
+                else:
+                    print(f"[{i:3}] → пусто")
         
         load = self.size / self.capacity
         print(f"Коэффициент загрузки: {load:.2f} (порог: {self.load_factor})")
 
 
+class RobinHoodHashTable:
+    """Открытая адресация с Robin Hood: ключи, значения и хэши в параллельных массивах.
+
+    Запись, ушедшая дальше от своей корзины, вытесняет более "богатую" соседку,
+    поэтому длины проб выравниваются, а поиск останавливается, как только
+    встречена запись ближе к дому, чем искомая. Удаление сдвигает хвост
+    кластера назад, так что надгробий нет.
+    """
+
+    def __init__(self, capacity=16, load_factor=0.85):
+        self.capacity = 1
+        while self.capacity < capacity:
+            self.capacity *= 2
+        self.load_factor = load_factor
+        self.size = 0
+        self.mask = self.capacity - 1
+        self.hashes = array('q', [EMPTY]) * self.capacity
+        self.keys = [None] * self.capacity
+        self.values = [None] * self.capacity
+
+    def _find(self, key, hash_val):
+        hashes, keys, mask = self.hashes, self.keys, self.mask
+        index = hash_val & mask
+        dist = 0
+        while True:
+            slot_hash = hashes[index]
+            if slot_hash == EMPTY or (index - slot_hash) & mask < dist:
+                return -1
+            if slot_hash == hash_val and keys[index] == key:
+                return index
+            index = (index + 1) & mask
+            dist += 1
+
+    def _insert(self, hash_val, key, value):
+        # ключа в таблице заведомо нет: после вытеснения двигаем дальше уже чужую запись
+        hashes, keys, values, mask = self.hashes, self.keys, self.values, self.mask
+        index = hash_val & mask
+        dist = 0
+        while True:
+            slot_hash = hashes[index]
+            if slot_hash == EMPTY:
+                hashes[index] = hash_val
+                keys[index] = key
+                values[index] = value
+                return
+            slot_dist = (index - slot_hash) & mask
+            if slot_dist < dist:
+                hashes[index], hash_val = hash_val, slot_hash
+                keys[index], key = key, keys[index]
+                values[index], value = value, values[index]
+                dist = slot_dist
+            index = (index + 1) & mask
+            dist += 1
+
+    def put(self, key, value):
+        hash_val = spread(djb2(key))
+        index = self._find(key, hash_val)
+        if index >= 0:
+            self.values[index] = value
+            return
+        if self.size + 1 > self.capacity * self.load_factor:
+            self._resize(self.capacity * 2)
+        self._insert(hash_val, key, value)
+        self.size += 1
+
+    def get(self, key):
+        # тот же цикл, что в _find, без лишнего вызова: get - самая частая операция
+        hash_val = spread(djb2(key))
+        hashes, keys, mask = self.hashes, self.keys, self.mask
+        index = hash_val & mask
+        dist = 0
+        while True:
+            slot_hash = hashes[index]
+            if slot_hash == EMPTY or (index - slot_hash) & mask < dist:
+                raise KeyError(f"Ключ '{key}' не найден")
+            if slot_hash == hash_val and keys[index] == key:
+                return self.values[index]
+            index = (index + 1) & mask
+            dist += 1
+
+    def remove(self, key):
+        index = self._find(key, spread(djb2(key)))
+        if index < 0:
+            raise KeyError(f"Ключ '{key}' не найден")
+        hashes, keys, values, mask = self.hashes, self.keys, self.values, self.mask
+        value = values[index]
+
+        # backward shift: подтягиваем записи, стоящие не на своём месте, на шаг назад
+        nxt = (index + 1) & mask
+        while hashes[nxt] != EMPTY and (nxt - hashes[nxt]) & mask != 0:
+            hashes[index] = hashes[nxt]
+            keys[index] = keys[nxt]
+            values[index] = values[nxt]
+            index = nxt
+            nxt = (nxt + 1) & mask
+        hashes[index] = EMPTY
+        keys[index] = None
+        values[index] = None
+        self.size -= 1
+        return value
+
+    def contains(self, key):
+        return self._find(key, spread(djb2(key))) >= 0
+
+    def _resize(self, new_capacity):
+        old = zip(self.hashes, self.keys, self.values)
+        self.capacity = new_capacity
+        self.mask = new_capacity - 1
+        self.hashes = array('q', [EMPTY]) * new_capacity
+        self.keys = [None] * new_capacity
+        self.values = [None] * new_capacity
+        # хэши хранятся, поэтому djb2 заново не считается
+        for hash_val, key, value in old:
+            if hash_val != EMPTY:
+                self._insert(hash_val, key, value)
+
+    def max_probe_length(self):
+        mask = self.mask
+        return max(((i - h) & mask for i, h in enumerate(self.hashes) if h != EMPTY), default=0)
+
+    def memory_usage(self):
+        """Байты на саму структуру: массивы слотов без объектов ключей и значений"""
+        return sys.getsizeof(self.hashes) + sys.getsizeof(self.keys) + sys.getsizeof(self.values)
+
+
+class MappedHashTable:
+    """Хэш-таблица в файле через mmap: открытие без перестройки, чтение значений без копирования.
+
+    Ключи и значения - bytes (str кодируется в UTF-8). Записи только дописываются
+    в кучу в конце файла; каталог корзин с открытой адресацией хранит хэш и
+    смещение записи и разбит на страницы по DIR_PAGE слотов, а заголовок
+    указывает на таблицу смещений этих страниц. До flush() изменяемая страница
+    один раз копируется в кучу, так что страницы и записи, на которые указывает
+    последний заголовок, не трогаются. flush() дописывает новую таблицу страниц,
+    сбрасывает данные, потом пишет заголовок в свободный из двух слотов
+    с новым поколением и crc32, так что после сбоя открывается последнее
+    целое состояние. Старые версии записей и страниц убирает compact().
+    """
+
+    def __init__(self, path, capacity=1024, load_factor=0.7, readonly=False):
+        self.path = path
+        self.load_factor = load_factor
+        self.readonly = readonly
+        self.initial_capacity = 1
+        while self.initial_capacity < capacity:
+            self.initial_capacity *= 2
+        self._open()
+
+    def _open(self):
+        if not os.path.exists(self.path) or os.path.getsize(self.path) == 0:
+            if self.readonly:
+                raise FileNotFoundError(self.path)
+            self._create()
+        self.file = open(self.path, 'rb' if self.readonly else 'r+b')
+        self.file_size = os.fstat(self.file.fileno()).st_size
+        access = mmap.ACCESS_READ if self.readonly else mmap.ACCESS_WRITE
+        self.mm = mmap.mmap(self.file.fileno(), 0, access=access)
+        self._read_header()
+        self.dirty = False
+
+    @staticmethod
+    def _page_layout(capacity):
+        # (сдвиг номера слота до номера страницы, число страниц)
+        shift = min(capacity, DIR_PAGE).bit_length() - 1
+        return shift, capacity >> shift
+
+    @staticmethod
+    def _pack_pages(pages):
+        return struct.pack(f'<{len(pages)}Q', *pages)
+
+    def _create(self):
+        capacity = self.initial_capacity
+        shift, page_count = self._page_layout(capacity)
+        page_size = ENTRY.size << shift
+        table_offset = DATA_START + capacity * ENTRY.size
+        pages = range(DATA_START, table_offset, page_size)
+        heap_end = table_offset + page_count * 8
+        with open(self.path, 'wb') as f:
+            f.truncate(heap_end)
+            f.seek(table_offset)
+            f.write(self._pack_pages(pages))
+            f.seek(HEADER_SLOT)
+            f.write(self._pack_header(1, table_offset, capacity, 0, 0, heap_end))
+            f.flush()
+            os.fsync(f.fileno())
+
+    @staticmethod
+    def _pack_header(generation, page_table, dir_capacity, count, used, heap_end):
+        body = HEADER.pack(FILE_MAGIC, generation, page_table, dir_capacity, count, used, heap_end)
+        return body + struct.pack('<I', zlib.crc32(body))
+
+    def _read_header(self):
+        best = None
+        for slot in range(2):
+            offset = slot * HEADER_SLOT
+            body = self.mm[offset:offset + HEADER.size]
+            crc, = struct.unpack_from('<I', self.mm, offset + HEADER.size)
+            fields = HEADER.unpack(body)
+            # недописанный при сбое слот не проходит проверку crc и пропускается
+            if fields[0] == FILE_MAGIC and crc == zlib.crc32(body):
+                if best is None or fields[1] > best[1]:
+                    best = fields
+        if best is None:
+            raise ValueError(f"Файл '{self.path}' не является хэш-таблицей или повреждён")
+        _, self.generation, self.page_table, self.dir_capacity, self.count, self.used, self.heap_end = best
+        self.page_shift, page_count = self._page_layout(self.dir_capacity)
+        self.page_mask = (1 << self.page_shift) - 1
+        self.pages = list(struct.unpack_from(f'<{page_count}Q', self.mm, self.page_table))
+        # страницы, уже скопированные после последнего flush: их можно менять на месте
+        self.copied = bytearray(page_count)
+
+    def _check_writable(self):
+        if self.readonly:
+            raise PermissionError("Таблица открыта только для чтения")
+
+    def _reserve(self, size):
+        need = self.heap_end + size
+        if need <= self.file_size:
+            return
+        new_size = max(self.file_size * 2, need)
+        self.file.truncate(new_size)
+        old = self.mm
+        self.mm = mmap.mmap(self.file.fileno(), new_size, access=mmap.ACCESS_WRITE)
+        self.file_size = new_size
+        try:
+            old.close()
+        except BufferError:
+            # на старое отображение ещё смотрят выданные get() memoryview; закроется сборщиком
+            pass
+
+    def _append(self, data):
+        self._reserve(len(data))
+        offset = self.heap_end
+        self.mm[offset:offset + len(data)] = data
+        self.heap_end += len(data)
+        return offset
+
+    def _entry_offset(self, index):
+        return self.pages[index >> self.page_shift] + (index & self.page_mask) * ENTRY.size
+
+    def _writable_entry(self, index):
+        """Смещение слота для записи; страница копируется при первом изменении после flush"""
+        page = index >> self.page_shift
+        if not self.copied[page]:
+            start = self.pages[page]
+            self.pages[page] = self._append(self.mm[start:start + (ENTRY.size << self.page_shift)])
+            self.copied[page] = 1
+        return self._entry_offset(index)
+
+    def _entries(self):
+        size = ENTRY.size << self.page_shift
+        for start in self.pages:
+            yield from ENTRY.iter_unpack(self.mm[start:start + size])
+
+    def _resize_directory(self):
+        # удалённые слоты тоже занимают место: если живых мало, хватает той же ёмкости
+        capacity = self.dir_capacity
+        if (self.count + 1) * 2 > capacity * self.load_factor:
+            capacity *= 2
+        size = capacity * ENTRY.size
+        old_entries = self._entries()
+        self._reserve(size)
+        offset = self.heap_end
+        self.mm[offset:offset + size] = bytes(size)
+        self.heap_end += size
+
+        mm, mask = self.mm, capacity - 1
+        for hash_val, record in old_entries:
+            if record > SLOT_DELETED:
+                index = hash_val & mask
+                while ENTRY.unpack_from(mm, offset + index * ENTRY.size)[1] != SLOT_EMPTY:
+                    index = (index + 1) & mask
+                ENTRY.pack_into(mm, offset + index * ENTRY.size, hash_val, record)
+        # новый каталог лежит одним куском и ещё не виден ни одному заголовку
+        self.page_shift, page_count = self._page_layout(capacity)
+        self.page_mask = (1 << self.page_shift) - 1
+        self.pages = list(range(offset, offset + size, ENTRY.size << self.page_shift))
+        self.copied = bytearray(b'\x01') * page_count
+        self.dir_capacity = capacity
+        self.used = self.count
+
+    def _probe(self, key, hash_val):
+        # (слот с ключом или -1, первый слот, куда можно вставить)
+        mm, pages, shift, page_mask = self.mm, self.pages, self.page_shift, self.page_mask
+        mask = self.dir_capacity - 1
+        index = hash_val & mask
+        free = -1
+        while True:
+            slot_hash, record = ENTRY.unpack_from(mm, pages[index >> shift] + (index & page_mask) * ENTRY.size)
+            if record == SLOT_EMPTY:
+                return -1, (free if free >= 0 else index)
+            if record == SLOT_DELETED:
+                if free < 0:
+                    free = index
+            elif slot_hash == hash_val:
+                key_len, _ = RECORD.unpack_from(mm, record)
+                start = record + RECORD.size
+                if mm[start:start + key_len] == key:
+                    return index, free
+            index = (index + 1) & mask
+
+    @staticmethod
+    def _to_bytes(data):
+        if isinstance(data, str):
+            return data.encode('utf-8')
+        # bytes(n) для целого дал бы n нулевых байт вместо ошибки
+        if isinstance(data, (bytes, bytearray, memoryview)):
+            return bytes(data)
+        raise TypeError(f"Ожидались str или bytes, получен {type(data).__name__}")
+
+    def put(self, key, value):
+        self._check_writable()
+        key = self._to_bytes(key)
+        self._put(spread(djb2(key)), key, self._to_bytes(value))
+
+    def _put(self, hash_val, key, value):
+        if self.used + 1 > self.dir_capacity * self.load_factor:
+            self._resize_directory()
+        slot, free = self._probe(key, hash_val)
+        record = self._append(RECORD.pack(len(key), len(value)) + key + value)
+        # копирование страницы может переотобразить файл: смещение берём до обращения к self.mm
+        position = self._writable_entry(slot if slot >= 0 else free)
+        if slot < 0:
+            if ENTRY.unpack_from(self.mm, position)[1] == SLOT_EMPTY:
+                self.used += 1
+            self.count += 1
+        ENTRY.pack_into(self.mm, position, hash_val, record)
+        self.dirty = True
+
+    def _value_view(self, record):
+        key_len, value_len = RECORD.unpack_from(self.mm, record)
+        start = record + RECORD.size + key_len
+        return memoryview(self.mm)[start:start + value_len]
+
+    def get(self, key, default=_MISSING):
+        """memoryview значения прямо в отображённом файле"""
+        key = self._to_bytes(key)
+        slot, _ = self._probe(key, spread(djb2(key)))
+        if slot >= 0:
+            _, record = ENTRY.unpack_from(self.mm, self._entry_offset(slot))
+            return self._value_view(record)
+        if default is _MISSING:
+            raise KeyError(f"Ключ '{key}' не найден")
+        return default
+
+    def remove(self, key):
+        self._check_writable()
+        key = self._to_bytes(key)
+        hash_val = spread(djb2(key))
+        slot, _ = self._probe(key, hash_val)
+        if slot < 0:
+            raise KeyError(f"Ключ '{key}' не найден")
+        position = self._writable_entry(slot)
+        _, record = ENTRY.unpack_from(self.mm, position)
+        ENTRY.pack_into(self.mm, position, hash_val, SLOT_DELETED)
+        self.count -= 1
+        self.dirty = True
+        # сама запись в куче остаётся до compact()
+        return self._value_view(record)
+
+    def contains(self, key):
+        key = self._to_bytes(key)
+        return self._probe(key, spread(djb2(key)))[0] >= 0
+
+    def __contains__(self, key):
+        return self.contains(key)
+
+    def __len__(self):
+        return self.count
+
+    def _records(self):
+        mm = self.mm
+        for hash_val, record in self._entries():
+            if record > SLOT_DELETED:
+                key_len, value_len = RECORD.unpack_from(mm, record)
+                start = record + RECORD.size
+                yield hash_val, mm[start:start + key_len], record
+
+    def items(self):
+        for _, key, record in self._records():
+            yield key, self._value_view(record)
+
+    def keys(self):
+        for _, key, _ in self._records():
+            yield key
+
+    def flush(self):
+        if self.readonly or not self.dirty:
+            return
+        # сначала данные, страницы и их таблица, потом заголовок: он указывает только на уже записанное
+        self.page_table = self._append(self._pack_pages(self.pages))
+        self.mm.flush()
+        self.generation += 1
+        header = self._pack_header(self.generation, self.page_table, self.dir_capacity,
+                                   self.count, self.used, self.heap_end)
+        offset = (self.generation % 2) * HEADER_SLOT
+        self.mm[offset:offset + len(header)] = header
+        self.mm.flush(0, DATA_START)
+        self.copied = bytearray(len(self.pages))
+        self.dirty = False
+
+    def compact(self):
+        """Переписывает файл только с живыми записями и заменяет им старый"""
+        self._check_writable()
+        tmp_path = self.path + ".compact"
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        capacity = 16
+        while self.count + 1 > capacity * self.load_factor:
+            capacity *= 2
+        fresh = MappedHashTable(tmp_path, capacity, self.load_factor)
+        # новый файл никто не видит до os.replace, копировать его страницы незачем
+        fresh.copied = bytearray(b'\x01') * len(fresh.pages)
+        for hash_val, key, record in self._records():
+            key_len, value_len = RECORD.unpack_from(self.mm, record)
+            start = record + RECORD.size + key_len
+            fresh._put(hash_val, key, self.mm[start:start + value_len])
+        fresh.close()
+        self._close_map()
+        # читатели, открывшие старый файл, продолжают видеть его целиком
+        os.replace(tmp_path, self.path)
+        self._open()
+
+    def refresh(self):
+        """Для читателей: увидеть последний flush() или compact() пишущего процесса"""
+        self._close_map()
+        self._open()
+
+    def _close_map(self):
+        try:
+            self.mm.close()
+        except BufferError:
+            pass
+        self.file.close()
+
+    def close(self):
+        self.flush()
+        self._close_map()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class TableSegment:
+    """Часть ConcurrentHashTable: свои корзины, своя блокировка, свой рост"""
+
+    def __init__(self, capacity):
+        self.lock = threading.Lock()
+        self.buckets = [None] * capacity
+        self.size = 0
+
+
+class ConcurrentHashTable:
+    """Хэш-таблица с блокировками по сегментам для общих на несколько потоков данных.
+
+    Запись берёт блокировку только своего сегмента. Чтение идёт без блокировки:
+    новый узел полностью собирается до того, как одним присваиванием попадает
+    в цепочку, удаление лишь переставляет next, а при росте сегмент строит
+    массив из копий узлов и подменяет ссылку на него целиком. Читатель всегда
+    видит целую цепочку - либо старую, либо новую.
+    """
+
+    def __init__(self, segments=16, capacity=16, load_factor=0.75):
+        count = 1
+        while count < segments:
+            count *= 2
+        self.segment_bits = count.bit_length() - 1
+        self.segment_mask = count - 1
+        per_segment = 1
+        while per_segment * count < capacity:
+            per_segment *= 2
+        self.load_factor = load_factor
+        self.segments = [TableSegment(per_segment) for _ in range(count)]
+
+    def _segment(self, hash_val):
+        # младшие биты выбирают сегмент, остальные - корзину внутри него
+        return self.segments[hash_val & self.segment_mask], hash_val >> self.segment_bits
+
+    def get(self, key, default=_MISSING):
+        hash_val = spread(djb2(key))
+        segment, rest = self._segment(hash_val)
+        buckets = segment.buckets
+        node = buckets[rest & (len(buckets) - 1)]
+        while node:
+            if node.hash == hash_val and node.key == key:
+                return node.value
+            node = node.next
+        if default is _MISSING:
+            raise KeyError(f"Ключ '{key}' не найден")
+        return default
+
+    def contains(self, key):
+        return self.get(key, _MISSING_VALUE) is not _MISSING_VALUE
+
+    def put(self, key, value):
+        hash_val = spread(djb2(key))
+        segment, rest = self._segment(hash_val)
+        with segment.lock:
+            buckets = segment.buckets
+            index = rest & (len(buckets) - 1)
+            node = buckets[index]
+            while node:
+                if node.hash == hash_val and node.key == key:
+                    node.value = value
+                    return
+                node = node.next
+            node = HashNode(key, value, hash_val)
+            node.next = buckets[index]
+            buckets[index] = node
+            segment.size += 1
+            if segment.size > len(buckets) * self.load_factor:
+                self._grow(segment)
+
+    def remove(self, key):
+        hash_val = spread(djb2(key))
+        segment, rest = self._segment(hash_val)
+        with segment.lock:
+            buckets = segment.buckets
+            index = rest & (len(buckets) - 1)
+            node = buckets[index]
+            prev = None
+            while node:
+                if node.hash == hash_val and node.key == key:
+                    if prev:
+                        prev.next = node.next
+                    else:
+                        buckets[index] = node.next
+                    segment.size -= 1
+                    return node.value
+                prev = node
+                node = node.next
+        raise KeyError(f"Ключ '{key}' не найден")
+
+    def _grow(self, segment):
+        # узлы копируются: перевешивать старые нельзя, по ним может идти читатель
+        old = segment.buckets
+        capacity = len(old) * 2
+        mask = capacity - 1
+        buckets = [None] * capacity
+        shift = self.segment_bits
+        for node in old:
+            while node:
+                copy = HashNode(node.key, node.value, node.hash)
+                index = (node.hash >> shift) & mask
+                copy.next = buckets[index]
+                buckets[index] = copy
+                node = node.next
+        segment.buckets = buckets
+
+    def __len__(self):
+        # без блокировок: при параллельной записи значение приблизительное
+        return sum(segment.size for segment in self.segments)
+
+    def __getitem__(self, key):
+        return self.get(key)
+
+    def __setitem__(self, key, value):
+        self.put(key, value)
+
+    def __delitem__(self, key):
+        self.remove(key)
+
+    def __contains__(self, key):
+        return self.contains(key)
+
+
+class CuckooHashTable:
+    """Кукушкино хэширование: у ключа два возможных места, по одному в каждой из двух таблиц.
+
+    Поиск смотрит не больше двух слотов и маленький stash, поэтому его время
+    не зависит от распределения ключей. Вставка вытесняет занявшую место запись
+    в её другую таблицу; если цепочка вытеснений зациклилась, бездомная запись
+    уходит в stash, а когда и он полон, таблица перестраивается с новыми seed.
+    Места берутся из младших и старших 32 бит seeded_hash(ключ) с новым seed, так что
+    ключи, подобранные под одинаковый djb2 или hash(), при новом seed расходятся.
+    Если CUCKOO_REBUILDS перестроений подряд не помогли (ключи совпадают при
+    любом seed - так бывает только у типов, хэшируемых через hash()), лишние
+    записи остаются в stash сверх лимита, и их поиск становится линейным.
+    """
+
+    def __init__(self, capacity=16, load_factor=0.45, max_kicks=32, seed=None):
+        self.load_factor = load_factor
+        self.max_kicks = max_kicks
+        self.rng = random.Random(seed)
+        self.rebuilds = 0
+        per_table = 1
+        while per_table * 2 < capacity:
+            per_table *= 2
+        self._reset(per_table)
+
+    def _reset(self, per_table):
+        self.capacity = per_table
+        self.mask = per_table - 1
+        self.hashers = seeded_hashers(self.rng.getrandbits(128).to_bytes(16, 'little'))
+        self.keys1 = [_MISSING] * per_table
+        self.values1 = [None] * per_table
+        self.keys2 = [_MISSING] * per_table
+        self.values2 = [None] * per_table
+        self.stash = []
+        # stash разрешено растить сверх CUCKOO_STASH: перестроения не помогают
+        self.overflow = False
+        self.size = 0
+
+    def _slots(self, key):
+        hash_val = seeded_hash(key, self.hashers)
+        return hash_val & self.mask, (hash_val >> 32) & self.mask
+
+    def get(self, key, default=_MISSING):
+        hash_val = seeded_hash(key, self.hashers)
+        index = hash_val & self.mask
+        if self.keys1[index] == key:
+            return self.values1[index]
+        index = (hash_val >> 32) & self.mask
+        if self.keys2[index] == key:
+            return self.values2[index]
+        for stashed_key, value in self.stash:
+            if stashed_key == key:
+                return value
+        if default is _MISSING:
+            raise KeyError(f"Ключ '{key}' не найден")
+        return default
+
+    def contains(self, key):
+        return self.get(key, _MISSING_VALUE) is not _MISSING_VALUE
+
+    def put(self, key, value):
+        first, second = self._slots(key)
+        if self.keys1[first] == key:
+            self.values1[first] = value
+            return
+        if self.keys2[second] == key:
+            self.values2[second] = value
+            return
+        for i, (stashed_key, _) in enumerate(self.stash):
+            if stashed_key == key:
+                self.stash[i] = (key, value)
+                return
+
+        if self.size + 1 > 2 * self.capacity * self.load_factor:
+            self._rebuild(self.capacity * 2, [(key, value)])
+            return
+        homeless = self._place(key, value)
+        if homeless is None:
+            self.size += 1
+        else:
+            # в таблицах и stash сейчас все записи, кроме бездомной
+            self._rebuild(self.capacity, [homeless])
+
+    def _place(self, key, value):
+        # None - запись (и все вытесненные) на местах; иначе пара, которой места не нашлось
+        keys1, values1, keys2, values2 = self.keys1, self.values1, self.keys2, self.values2
+        hashers, mask = self.hashers, self.mask
+        for _ in range(self.max_kicks):
+            index = seeded_hash(key, hashers) & mask
+            key, keys1[index] = keys1[index], key
+            value, values1[index] = values1[index], value
+            if key is _MISSING:
+                return None
+            index = (seeded_hash(key, hashers) >> 32) & mask
+            key, keys2[index] = keys2[index], key
+            value, values2[index] = values2[index], value
+            if key is _MISSING:
+                return None
+        if self.overflow or len(self.stash) < CUCKOO_STASH:
+            self.stash.append((key, value))
+            return None
+        return key, value
+
+    def _rebuild(self, per_table, extra):
+        items = list(self.items()) + extra
+        for attempt in range(CUCKOO_REBUILDS):
+            self._reset(per_table)
+            if all(self._place(key, value) is None for key, value in items):
+                self.size = len(items)
+                return
+            self.rebuilds += 1
+            # новые seed не помогли несколько раз подряд - значит, тесно
+            if attempt % 4 == 3:
+                per_table *= 2
+        # ключи совпадают при любом seed: расти дальше бесполезно, лишние идут в stash
+        self._reset(per_table)
+        self.overflow = True
+        for key, value in items:
+            self._place(key, value)
+        self.size = len(items)
+
+    def remove(self, key):
+        first, second = self._slots(key)
+        if self.keys1[first] == key:
+            value = self.values1[first]
+            self.keys1[first], self.values1[first] = _MISSING, None
+        elif self.keys2[second] == key:
+            value = self.values2[second]
+            self.keys2[second], self.values2[second] = _MISSING, None
+        else:
+            for i, (stashed_key, value) in enumerate(self.stash):
+                if stashed_key == key:
+                    del self.stash[i]
+                    break
+            else:
+                raise KeyError(f"Ключ '{key}' не найден")
+        self.size -= 1
+        return value
+
+    def items(self):
+        for keys, values in ((self.keys1, self.values1), (self.keys2, self.values2)):
+            for key, value in zip(keys, values):
+                if key is not _MISSING:
+                    yield key, value
+        yield from self.stash
+
+    def __len__(self):
+        return self.size
+
+
+class HashTableItems(ItemsView):
+    # обход по узлам напрямую, без повторного поиска значения по ключу
+    def __iter__(self):
+        for node in self._mapping._iter_nodes():
+            yield node.key, node.value
+
+
+class HashTableValues(ValuesView):
+    def __iter__(self):
+        for node in self._mapping._iter_nodes():
+            yield node.value
+
+
 def test_hash_table():
     
     print("ТЕСТИРОВАНИЕ ХЭШ-ТАБЛИЦЫ")
@@ -143,7 +1209,7 @@ def test_hash_table():
     test_keys = ["банан", "виноград", "дыня"]
     for key in test_keys:
         try:
-            value = ht.get(key)
+            value = ht.get_or_raise(key)
             print(f"Ключ '{key}' -> значение '{value}'")
         except KeyError as e:
             print(f"Ошибка: {e}")
@@ -180,8 +1246,353 @@ def test_hash_table():
     print(f"Ключ 456 -> {ht.get(456)}")
     
     ht.visualize()
+
+    print("\n7. Тест таблицы в файле (MappedHashTable):")
+
+    def snapshot(path):
+        reader = MappedHashTable(path, readonly=True)
+        state = {bytes(key).decode(): bytes(value) for key, value in reader.items()}
+        reader.close()
+        return state
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "table.bin")
+        # 1024 слота - четыре страницы каталога
+        writer = MappedHashTable(path, capacity=1024)
+        flushed = {f"key{i}": f"value{i}".encode() for i in range(300)}
+        for key, value in flushed.items():
+            writer.put(key, value)
+        writer.flush()
+
+        # изменения без flush() идут в копии страниц, заголовок на них ещё не указывает
+        writer.put("key0", b"changed")
+        writer.put("new", b"value")
+        writer.remove("key1")
+        assert snapshot(path) == flushed
+        print(f"До flush читатель видит {len(flushed)} ключей, key0 -> {snapshot(path)['key0']}")
+
+        writer.flush()
+        current = dict(flushed, key0=b"changed", new=b"value")
+        del current["key1"]
+        assert snapshot(path) == current
+        print(f"После flush: {len(current)} ключей, key0 -> {snapshot(path)['key0']}")
+
+        # оборванная запись заголовка: слот последнего поколения не проходит crc,
+        # и файл открывается в состоянии предыдущего flush
+        torn = os.path.join(directory, "torn.bin")
+        with open(path, 'rb') as src, open(torn, 'wb') as dst:
+            dst.write(src.read())
+            dst.seek((writer.generation % 2) * HEADER_SLOT + len(FILE_MAGIC))
+            dst.write(bytes(8))
+        assert snapshot(torn) == flushed
+        print("Испорченный последний заголовок: открылось предыдущее поколение")
+
+        before = writer.heap_end
+        writer.compact()
+        after = writer.heap_end
+        writer.close()
+        assert snapshot(path) == current and after < before
+        print(f"compact: {before:,} -> {after:,} байт, содержимое то же")
+
     print("ТЕСТИРОВАНИЕ ЗАВЕРШЕНО")
 
 
+def chaining_memory_usage(table):
+    total = sys.getsizeof(table.buckets)
+    for bucket in table.buckets + (table.old_buckets or []):
+        node = bucket
+        while node:
+            total += sys.getsizeof(node)
+            node = node.next
+    return total
+
+
+def benchmark_engines(sizes=(10 ** 4, 10 ** 5, 10 ** 6), lookups=200000, seed=1):
+    """ops/s и байт на запись: цепочки, Robin Hood и dict. Для 10**7 передать sizes явно (нужно ~4 ГБ)"""
+    rng = random.Random(seed)
+    print("\nДвижки хэш-таблицы: вставка и поиск, ops/s; память структуры, байт на запись")
+    print(f"{'ключей':>9} {'движок':<12} {'put':>11} {'get':>11} {'промах':>11} {'remove':>11} {'байт':>7}")
+    for n in sizes:
+        keys = [f"key{i}" for i in range(n)]
+        hits = [keys[rng.randrange(n)] for _ in range(min(lookups, n))]
+        misses = [f"absent{i}" for i in range(len(hits))]
+        victims = hits[:len(hits) // 2]
+
+        engines = [
+            ("цепочки", CustomHashTable(), chaining_memory_usage),
+            ("robin hood", RobinHoodHashTable(), RobinHoodHashTable.memory_usage),
+            ("dict", None, sys.getsizeof),
+        ]
+        for name, table, memory in engines:
+            if table is None:
+                table = {}
+                put, get, contains, remove = table.__setitem__, table.__getitem__, table.__contains__, table.pop
+            else:
+                put, get, contains, remove = table.put, table.get, table.contains, table.remove
+
+            start = time.perf_counter()
+            for i, key in enumerate(keys):
+                put(key, i)
+            put_rate = n / (time.perf_counter() - start)
+            bytes_per_entry = memory(table) / n
+
+            start = time.perf_counter()
+            for key in hits:
+                get(key)
+            get_rate = len(hits) / (time.perf_counter() - start)
+
+            start = time.perf_counter()
+            for key in misses:
+                contains(key)
+            miss_rate = len(misses) / (time.perf_counter() - start)
+
+            start = time.perf_counter()
+            for key in set(victims):
+                remove(key)
+            remove_rate = len(set(victims)) / (time.perf_counter() - start)
+
+            print(f"{n:>9,} {name:<12} {put_rate:>11,.0f} {get_rate:>11,.0f} "
+                  f"{miss_rate:>11,.0f} {remove_rate:>11,.0f} {bytes_per_entry:>7.1f}")
+            del table, put, get, contains, remove
+
+
+def latency_histogram(latencies):
+    # корзины по степеням двойки в микросекундах
+    histogram = {}
+    for ns in latencies:
+        bucket = max(ns // 1000, 1).bit_length() - 1
+        histogram[bucket] = histogram.get(bucket, 0) + 1
+    return histogram
+
+
+def benchmark_rehash_latency(n=1000000):
+    print(f"\nЗадержка put при росте таблицы до {n:,} ключей")
+    keys = [f"key{i}" for i in range(n)]
+    results = []
+    for title, step in (("всё сразу", None), ("по 1 корзине", 1), ("по 4 корзины", 4)):
+        table = CustomHashTable(rehash_step=step)
+        put = table.put
+        latencies = array('q', bytes(8 * n))
+        clock = time.perf_counter_ns
+        # сборщик циклов на миллионе узлов сам даёт паузы в сотни мс и заслоняет рехэширование
+        gc.disable()
+        try:
+            for i, key in enumerate(keys):
+                start = clock()
+                put(key, i)
+                latencies[i] = clock() - start
+        finally:
+            gc.enable()
+        ordered = sorted(latencies)
+        percentiles = [ordered[int(n * q) - 1] / 1000 for q in (0.5, 0.99, 0.999)]
+        results.append((title, latency_histogram(latencies)))
+        print(f"{title:<14} p50 {percentiles[0]:6.1f} мкс  p99 {percentiles[1]:6.1f} мкс  "
+              f"p99.9 {percentiles[2]:7.1f} мкс  max {ordered[-1] / 1000:10.1f} мкс  "
+              f"всего {sum(latencies) / 1e9:.2f} с")
+        del table, put
+
+    print("\nГистограмма, число put по диапазонам задержки:")
+    top = max(max(h) for _, h in results)
+    print(f"{'мкс':>16}" + "".join(f"{title:>16}" for title, _ in results))
+    for bucket in range(top + 1):
+        label = f"{1 << bucket}-{1 << (bucket + 1)}" if bucket else "<2"
+        print(f"{label:>16}" + "".join(f"{h.get(bucket, 0):>16,}" for _, h in results))
+
+
+def benchmark_mapping(n=200000, seed=1):
+    print(f"\nCustomHashTable как MutableMapping, {n:,} ключей, ops/s:")
+    rng = random.Random(seed)
+    keys = [f"key{i}" for i in range(n)]
+    pairs = [(key, i) for i, key in enumerate(keys)]
+    lookups = [keys[rng.randrange(n)] for _ in range(n)]
+    misses = [f"absent{i}" for i in range(n)]
+
+    def old_contains(table, key):
+        # прежний contains: через поиск с исключением
+        try:
+            table.get_or_raise(key)
+            return True
+        except KeyError:
+            return False
+
+    table = CustomHashTable()
+    cases = [
+        ("put в цикле", lambda: [table.put(k, v) for k, v in pairs]),
+        ("put_many", lambda: CustomHashTable().put_many(pairs)),
+        ("update(dict)", lambda: CustomHashTable().update(dict(pairs))),
+        ("get в цикле", lambda: [table.get(k) for k in lookups]),
+        ("get_many", lambda: table.get_many(lookups)),
+        ("промах, get+KeyError", lambda: [old_contains(table, k) for k in misses]),
+        ("промах, in", lambda: [k in table for k in misses]),
+        ("items()", lambda: [v for _, v in table.items()]),
+        ("keys() + []", lambda: [table[k] for k in table.keys()]),
+    ]
+    for title, run in cases:
+        start = time.perf_counter()
+        run()
+        print(f"{title:<22} {n / (time.perf_counter() - start):>12,.0f}")
+
+
+def benchmark_mapped(n=200000, seed=1):
+    print(f"\nТаблица в файле, {n:,} ключей:")
+    rng = random.Random(seed)
+    pairs = [(f"key{i}", f"value-{i}".encode()) for i in range(n)]
+    lookups = [pairs[rng.randrange(n)][0] for _ in range(n)]
+
+    start = time.perf_counter()
+    table = CustomHashTable()
+    table.put_many(pairs)
+    print(f"{'перестройка CustomHashTable':<30} {time.perf_counter() - start:>10.3f} с")
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "table.bin")
+        start = time.perf_counter()
+        with MappedHashTable(path, capacity=n * 2) as mapped:
+            for key, value in pairs:
+                mapped.put(key, value)
+        print(f"{'первичная запись в файл':<30} {time.perf_counter() - start:>10.3f} с")
+
+        start = time.perf_counter()
+        mapped = MappedHashTable(path, readonly=True)
+        print(f"{'открытие готового файла':<30} {(time.perf_counter() - start) * 1000:>10.3f} мс")
+
+        for title, get in (("get, CustomHashTable", table.get), ("get, файл (memoryview)", mapped.get)):
+            start = time.perf_counter()
+            for key in lookups:
+                get(key)
+            print(f"{title:<30} {n / (time.perf_counter() - start):>10,.0f} ops/s")
+        mapped.close()
+
+        with MappedHashTable(path) as mapped:
+            for key, value in pairs[::2]:
+                mapped.put(key, value + b"!")
+            mapped.flush()
+            # размер файла растёт удвоением, полезный объём - до конца кучи
+            before = mapped.heap_end
+            start = time.perf_counter()
+            mapped.compact()
+            compact_time = time.perf_counter() - start
+            after = mapped.heap_end
+        print(f"{'compact после перезаписи 50%':<30} {compact_time:>10.3f} с, "
+              f"данные {before / 2 ** 20:.1f} -> {after / 2 ** 20:.1f} МБ")
+
+
+class LockedHashTable:
+    """CustomHashTable под одной общей блокировкой - точка отсчёта для ConcurrentHashTable"""
+
+    def __init__(self):
+        self.table = CustomHashTable()
+        self.lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self.lock:
+            return self.table.get(key, default)
+
+    def put(self, key, value):
+        with self.lock:
+            self.table.put(key, value)
+
+
+def benchmark_concurrent(thread_counts=(1, 2, 4, 8), ops_per_thread=100000, keys=50000, seed=1):
+    gil = getattr(sys, "_is_gil_enabled", lambda: True)()
+    print(f"\nПараллельный доступ, 90% чтений / 10% записей, ops/s "
+          f"({'с GIL' if gil else 'без GIL'}, Python {sys.version.split()[0]}):")
+    key_space = [f"key{i}" for i in range(keys)]
+    print(f"{'потоков':>8} {'одна блокировка':>18} {'сегменты':>14}")
+    for threads in thread_counts:
+        rates = []
+        for table in (LockedHashTable(), ConcurrentHashTable(segments=64)):
+            for i, key in enumerate(key_space):
+                table.put(key, i)
+            barrier = threading.Barrier(threads + 1)
+
+            def worker(worker_seed, table=table, barrier=barrier):
+                rng = random.Random(worker_seed)
+                plan = [(key_space[rng.randrange(keys)], rng.random() < 0.1) for _ in range(ops_per_thread)]
+                get, put = table.get, table.put
+                barrier.wait()
+                for key, write in plan:
+                    if write:
+                        put(key, 1)
+                    else:
+                        get(key)
+
+            workers = [threading.Thread(target=worker, args=(seed + i,)) for i in range(threads)]
+            for thread in workers:
+                thread.start()
+            barrier.wait()
+            start = time.perf_counter()
+            for thread in workers:
+                thread.join()
+            rates.append(threads * ops_per_thread / (time.perf_counter() - start))
+        print(f"{threads:>8} {rates[0]:>18,.0f} {rates[1]:>14,.0f}")
+
+
+def benchmark_stats(n=1000000):
+    print(f"\nstats() на таблице из {n:,} ключей:")
+    table = CustomHashTable(sample_every=64)
+    table.put_many((f"key{i}", i) for i in range(n))
+    for i in range(0, 2 * n, 7):
+        table.contains(f"key{i}")
+
+    for max_buckets in (4096, None):
+        start = time.perf_counter()
+        info = table.stats(max_buckets)
+        elapsed = time.perf_counter() - start
+        print(f"max_buckets={max_buckets}: {elapsed * 1000:.2f} мс, "
+              f"просмотрено {info['scanned_buckets']:,} из {info['buckets']:,} корзин")
+    print({key: value for key, value in info.items() if key != 'chain_histogram'})
+    print(f"Цепочки: {info['chain_histogram']}")
+
+    # плохое распределение: целые ключи кратны ёмкости и ложатся в одну корзину
+    bad = CustomHashTable(capacity=1024, load_factor=10 ** 9)
+    for i in range(2000):
+        bad.put(i * 1024, i)
+    info = bad.stats()
+    print(f"Ключи кратные ёмкости: max_chain={info['max_chain']}, "
+          f"mean_probe_hit={info['mean_probe_hit']:.1f}, цепочки {info['chain_histogram']}")
+
+
+def djb2_colliding_keys(count):
+    """Строки с одинаковым djb2: блоки "aB" и "b!" дают одну и ту же сумму 97*33+66 = 98*33+33"""
+    width = max(count - 1, 1).bit_length()
+    return ["".join("b!" if (i >> bit) & 1 else "aB" for bit in range(width)) for i in range(count)]
+
+
+def benchmark_cuckoo(n=4096, lookups=20000, seed=1):
+    print(f"\nЗадержка get, {n:,} ключей, мкс:")
+    rng = random.Random(seed)
+    key_sets = [("обычные ключи", [f"key{i}" for i in range(n)]), ("коллизии djb2", djb2_colliding_keys(n))]
+    print(f"{'':<15} {'движок':<12} {'p50':>8} {'p99':>8} {'max':>9} {'вставка, с':>11}")
+    for title, keys in key_sets:
+        assert title == "обычные ключи" or len({djb2(key) for key in keys}) == 1
+        plan = [keys[rng.randrange(n)] for _ in range(lookups)]
+        for name, table in (("цепочки", CustomHashTable()), ("robin hood", RobinHoodHashTable()),
+                            ("кукушка", CuckooHashTable(seed=seed)), ("dict", {})):
+            put = table.__setitem__ if isinstance(table, dict) else table.put
+            get = table.__getitem__ if isinstance(table, dict) else table.get
+            start = time.perf_counter()
+            for i, key in enumerate(keys):
+                put(key, i)
+            build_time = time.perf_counter() - start
+
+            latencies = array('q', bytes(8 * lookups))
+            clock = time.perf_counter_ns
+            for i, key in enumerate(plan):
+                start = clock()
+                get(key)
+                latencies[i] = clock() - start
+            ordered = sorted(latencies)
+            p50, p99 = ordered[lookups // 2] / 1000, ordered[int(lookups * 0.99)] / 1000
+            print(f"{title:<15} {name:<12} {p50:>8.2f} {p99:>8.2f} {ordered[-1] / 1000:>9.1f} {build_time:>11.3f}")
+
+
 if __name__ == "__main__":
-    test_hash_table()
\ No newline at end of file
+    test_hash_table()
+    benchmark_engines()
+    benchmark_rehash_latency()
+    benchmark_mapping()
+    benchmark_mapped()
+    benchmark_concurrent()
+    benchmark_stats()
+    benchmark_cuckoo()
\ No newline at end of file
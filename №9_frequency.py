@@ -1,6 +1,118 @@
+import codecs
+from concurrent.futures import ProcessPoolExecutor
+import os
+import random
+import tempfile
 import time
 import re
-from collections import defaultdict
+from collections import Counter, defaultdict
+
+
+def iter_text_chunks(source, chunk_size=1 << 20, encoding='utf-8'):
+    """Куски текста из пути к файлу, открытого файла (текстового или двоичного) или итерируемого строк"""
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, encoding=encoding, newline='') as f:
+            yield from iter_text_chunks(f, chunk_size)
+        return
+    if hasattr(source, 'read'):
+        decoder = None
+        while True:
+            chunk = source.read(chunk_size)
+            if not chunk:
+                break
+            if isinstance(chunk, bytes):
+                # многобайтный символ может разрезаться на границе куска
+                decoder = decoder or codecs.getincrementaldecoder(encoding)()
+                chunk = decoder.decode(chunk)
+            yield chunk
+        if decoder is not None:
+            tail = decoder.decode(b'', final=True)
+            if tail:
+                yield tail
+        return
+    yield from source
+
+
+# однобайтные пробельные символы str.split(); в UTF-8 такие байты не встречаются внутри многобайтных символов
+ASCII_SPACE_RE = re.compile(rb'[\t\n\x0b\x0c\r\x1c-\x1f ]')
+
+
+def split_word_ranges(path, parts, probe_size=1 << 16):
+    """Делит файл на parts диапазонов байт [start, end), каждый начинается сразу после пробельного байта"""
+    size = os.path.getsize(path)
+    bounds = [0]
+    with open(path, 'rb') as f:
+        for i in range(1, parts):
+            position = max(size * i // parts, bounds[-1])
+            f.seek(position)
+            # ищем ближайший пробел после номинальной границы; нет - диапазон тянется дальше
+            while position < size:
+                block = f.read(probe_size)
+                match = ASCII_SPACE_RE.search(block)
+                if match:
+                    position += match.end()
+                    break
+                position += len(block)
+            if bounds[-1] < position < size:
+                bounds.append(position)
+    bounds.append(size)
+    return list(zip(bounds, bounds[1:]))
+
+
+def count_range(path, start, end, chunk_size=1 << 20, encoding='utf-8'):
+    """Частоты слов в байтах [start, end) файла - задача для процесса-исполнителя"""
+    def pieces():
+        decoder = codecs.getincrementaldecoder(encoding)()
+        with open(path, 'rb') as f:
+            f.seek(start)
+            left = end - start
+            while left > 0:
+                data = f.read(min(chunk_size, left))
+                if not data:
+                    break
+                left -= len(data)
+                yield decoder.decode(data)
+        yield decoder.decode(b'', final=True)
+
+    return FrequencyDictionary().build_frequency_stream(pieces(), chunk_size)
+
+
+def merge_tree(tables):
+    """Сливает частичные словари попарно, соседний с соседним: порядок слов - как при одном проходе"""
+    tables = list(tables)
+    while len(tables) > 1:
+        merged = []
+        for left, right in zip(tables[::2], tables[1::2]):
+            get = left.get
+            for word, count in right.items():
+                left[word] = get(word, 0) + count
+            merged.append(left)
+        if len(tables) % 2:
+            merged.append(tables[-1])
+        tables = merged
+    return tables[0] if tables else {}
+
+
+def read_rss_peak():
+    """Пиковый RSS процесса в байтах (Linux, /proc), или None"""
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return None
+
+
+def reset_rss_peak():
+    # "5" в clear_refs сбрасывает VmHWM до текущего RSS
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+        return True
+    except OSError:
+        return False
 
 
 class BadHash:
@@ -40,6 +152,48 @@ class FrequencyDictionary:
         
         return freq_dict
     
+    def build_frequency_stream(self, source, chunk_size=1 << 20, encoding='utf-8'):
+        r"""То же, что build_frequency_dict, но по кускам: в памяти словарь и один кусок текста.
+
+        Последнее слово куска может быть обрезано, поэтому всё после последнего
+        пробельного символа переносится в начало следующего куска. str.split()
+        и \s в re понимают пробельные символы одинаково, так что слова
+        получаются те же, что при разборе всего текста сразу.
+        """
+        counts = Counter()
+        carry = ''
+        for chunk in iter_text_chunks(source, chunk_size, encoding):
+            text = carry + chunk
+            if not text or text[-1].isspace():
+                head, carry = text, ''
+            else:
+                carry = text.rsplit(None, 1)[-1]
+                head = text[:len(text) - len(carry)]
+            counts.update(self.clean_text(head).split())
+        if carry:
+            counts.update(self.clean_text(carry).split())
+        return dict(counts)
+    
+    def build_frequency_parallel(self, path, workers=None, chunk_size=1 << 20, encoding='utf-8'):
+        """build_frequency_dict по файлу, посчитанный в workers процессах.
+
+        Файл режется на диапазоны байт по однобайтным пробельным символам, поэтому
+        ни слово, ни многобайтный символ не попадают в два диапазона. Кодировка
+        должна совпадать с ASCII на пробельных символах (UTF-8, cp1251 и т.п.).
+        """
+        if " \t\n".encode(encoding) != b" \t\n":
+            raise ValueError(f"Кодировка {encoding} не совместима с ASCII, делить файл по байтам нельзя")
+        workers = workers or os.cpu_count() or 1
+        ranges = split_word_ranges(path, workers)
+        if workers == 1 or len(ranges) == 1:
+            tables = [count_range(path, start, end, chunk_size, encoding) for start, end in ranges]
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                futures = [executor.submit(count_range, path, start, end, chunk_size, encoding)
+                           for start, end in ranges]
+                tables = [future.result() for future in futures]
+        return merge_tree(tables)
+    
     def get_top_words(self, freq_dict, n=10):
         """Получение N самых частых слов"""
         return sorted(freq_dict.items(), key=lambda x: x[1], reverse=True)[:n]
@@ -72,6 +226,74 @@ class FrequencyDictionary:
         
         return freq_good, freq_bad, good_time, bad_time
 
+    def benchmark_streaming(self, size_mb=32, chunk_size=1 << 20, seed=1):
+        """Весь файл в память против потокового разбора: МБ/с и прирост пикового RSS"""
+        rng = random.Random(seed)
+        vocabulary = [f"слово{i}" for i in range(20000)] + ["Python", "хэш", "таблица"]
+        punctuation = ["", "", "", ",", ".", "!", " —"]
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "corpus.txt")
+            with open(path, 'w', encoding='utf-8') as f:
+                written = 0
+                while written < size_mb * 2 ** 20:
+                    line = " ".join(rng.choice(vocabulary) + rng.choice(punctuation) for _ in range(20)) + "\n"
+                    f.write(line)
+                    written += len(line.encode('utf-8'))
+            size = os.path.getsize(path)
+            print(f"\nЧастотный словарь по файлу {size / 2 ** 20:.1f} МБ:")
+
+            def whole_file():
+                with open(path, encoding='utf-8', newline='') as f:
+                    return self.build_frequency_dict(f.read())
+
+            results = []
+            for title, build in (("потоково", lambda: self.build_frequency_stream(path, chunk_size)),
+                                 ("весь файл", whole_file)):
+                peak_supported = reset_rss_peak()
+                before = read_rss_peak()
+                start = time.perf_counter()
+                result = build()
+                elapsed = time.perf_counter() - start
+                peak = read_rss_peak()
+                grown = f"{(peak - before) / 2 ** 20:8.1f} МБ" if peak_supported and peak else "     н/д"
+                print(f"{title:<10} {size / 2 ** 20 / elapsed:8.1f} МБ/с   прирост пикового RSS {grown}")
+                results.append(result)
+                del result
+            print(f"Результаты совпадают: {results[0] == results[1]}")
+
+    def benchmark_parallel(self, size_mb=32, worker_counts=None, seed=1):
+        """Ускорение build_frequency_parallel относительно build_frequency_dict на 1..N процессах"""
+        rng = random.Random(seed)
+        vocabulary = [f"слово{i}" for i in range(20000)] + ["Python", "хэш", "таблица"]
+        cores = os.cpu_count() or 1
+        if worker_counts is None:
+            worker_counts = sorted({1, cores} | {2 ** i for i in range(cores.bit_length()) if 2 ** i <= cores})
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "corpus.txt")
+            with open(path, 'w', encoding='utf-8') as f:
+                written = 0
+                while written < size_mb * 2 ** 20:
+                    line = " ".join(rng.choice(vocabulary) + rng.choice(",.! ") for _ in range(20)) + "\n"
+                    f.write(line)
+                    written += len(line.encode('utf-8'))
+            print(f"\nПараллельный подсчёт, файл {os.path.getsize(path) / 2 ** 20:.1f} МБ, ядер: {cores}")
+
+            start = time.perf_counter()
+            with open(path, encoding='utf-8', newline='') as f:
+                expected = self.build_frequency_dict(f.read())
+            serial_time = time.perf_counter() - start
+            print(f"{'последовательно':<18} {serial_time:8.2f} с")
+
+            for workers in worker_counts:
+                start = time.perf_counter()
+                result = self.build_frequency_parallel(path, workers)
+                elapsed = time.perf_counter() - start
+                same = result == expected and list(result) == list(expected)
+                print(f"{f'процессов: {workers}':<18} {elapsed:8.2f} с  ускорение x{serial_time / elapsed:.2f}"
+                      f"  {'совпадает' if same else 'РАСХОДИТСЯ'}")
+
 
 def test_frequency_dictionary():
 
@@ -173,4 +395,6 @@ def test_frequency_dictionary():
 
 
 if __name__ == "__main__":
-    test_frequency_dictionary()
\ No newline at end of file
+    test_frequency_dictionary()
+    FrequencyDictionary().benchmark_streaming()
+    FrequencyDictionary().benchmark_parallel()
\ No newline at end of file